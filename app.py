@@ -4,8 +4,11 @@ TriageBot - Confluence Page Fetcher
 A simple CLI tool to fetch and view Confluence pages.
 """
 import os
+import re
+import sys
+import time
 import argparse
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from dotenv import load_dotenv
 
 from confluence_loader import ConfluenceFetcher, setup_confluence_config
@@ -13,21 +16,48 @@ from confluence_loader import ConfluenceFetcher, setup_confluence_config
 # Load environment variables
 load_dotenv()
 
+# Patterns used to turn Confluence storage HTML into readable text
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+
+# Seconds a page listing is reused before Confluence is queried again
+PAGE_LIST_TTL = 60
+_page_list_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+
+def get_pages(fetcher: ConfluenceFetcher, refresh: bool = False) -> List[Dict[str, Any]]:
+    """Return the pages in the space, reusing a listing fetched within PAGE_LIST_TTL."""
+    space_key = fetcher.config.space_key
+    cached = _page_list_cache.get(space_key)
+    if not refresh and cached and time.monotonic() - cached[0] < PAGE_LIST_TTL:
+        return cached[1]
+    
+    pages = fetcher.list_pages()
+    _page_list_cache[space_key] = (time.monotonic(), pages)
+    return pages
+
+def print_page_list(fetcher: ConfluenceFetcher, pages: List[Dict[str, Any]]):
+    """Write a numbered page listing to stdout in a single call."""
+    base_url = f"{fetcher.config.url}/wiki"
+    sys.stdout.write(''.join(
+        f"{i}. {page['title']} (ID: {page['id']})\n"
+        f"   URL: {base_url}{page['_links']['webui']}\n"
+        f"   Last updated: {page['version']['when']}\n\n"
+        for i, page in enumerate(pages, 1)
+    ))
+    sys.stdout.flush()
+
 def list_pages(fetcher: ConfluenceFetcher):
     """List all pages in the Confluence space."""
     try:
         print("\nFetching pages from Confluence...")
-        pages = fetcher.list_pages()
+        pages = get_pages(fetcher)
         
         if not pages:
             print("No pages found in the space.")
             return
             
         print(f"\nFound {len(pages)} pages in space '{fetcher.config.space_key}':\n")
-        for i, page in enumerate(pages, 1):
-            print(f"{i}. {page['title']} (ID: {page['id']})")
-            print(f"   URL: {fetcher.config.url}/wiki{page['_links']['webui']}")
-            print(f"   Last updated: {page['version']['when']}\n")
+        print_page_list(fetcher, pages)
             
     except Exception as e:
         print(f"Error listing pages: {str(e)}")
@@ -51,9 +81,8 @@ def show_page(fetcher: ConfluenceFetcher, page_id: str, show_children: bool = Tr
         print("\n" + "-" * 80 + "\n")
         
         # Print the content with basic HTML tag stripping for better readability
-        import re
-        content = re.sub(r'<[^>]+>', '', page['content'])  # Remove HTML tags
-        content = re.sub(r'\s+', ' ', content).strip()  # Normalize whitespace
+        content = _HTML_TAG_RE.sub('', page['content'])  # Remove HTML tags
+        content = _WS_RE.sub(' ', content).strip()  # Normalize whitespace
         print(content[:1000] + ('...' if len(content) > 1000 else ''))
         
         # Show child pages if available
@@ -74,6 +103,7 @@ def show_page(fetcher: ConfluenceFetcher, page_id: str, show_children: bool = Tr
 def interactive_mode(fetcher: ConfluenceFetcher, initial_page_id: str = None):
     """Start an interactive session to browse Confluence pages."""
     current_page_id = initial_page_id
+    refresh_pages = False
     
     while True:
         if current_page_id:
@@ -130,14 +160,12 @@ def interactive_mode(fetcher: ConfluenceFetcher, initial_page_id: str = None):
             print(f"  TriageBot - Space: {fetcher.config.space_key}")
             print("=" * 60)
             print("  Type a page ID or select from the list below:")
-            print("  Type 'exit' to quit\n")
+            print("  Type 'refresh' to reload the list, 'exit' to quit\n")
             
-            pages = fetcher.list_pages()
+            pages = get_pages(fetcher, refresh=refresh_pages)
+            refresh_pages = False
             if pages:
-                for i, page in enumerate(pages, 1):
-                    print(f"{i}. {page['title']} (ID: {page['id']})")
-                    print(f"   URL: {fetcher.config.url}/wiki{page['_links']['webui']}")
-                    print(f"   Last updated: {page['version']['when']}\n")
+                print_page_list(fetcher, pages)
             
             user_input = input("Enter page ID or number: ").strip().lower()
             
@@ -145,7 +173,9 @@ def interactive_mode(fetcher: ConfluenceFetcher, initial_page_id: str = None):
                 print("Goodbye!")
                 break
                 
-            if user_input.isdigit():
+            if user_input == 'refresh':
+                refresh_pages = True
+            elif user_input.isdigit():
                 page_num = int(user_input)
                 if 1 <= page_num <= len(pages):
                     current_page_id = pages[page_num - 1]['id']
@@ -153,35 +183,7 @@ def interactive_mode(fetcher: ConfluenceFetcher, initial_page_id: str = None):
                     print("Invalid page number.")
             else:
                 current_page_id = user_input
-    
-    while True:
-        try:
-            command = input("\n> ").strip().split()
-            
-            if not command:
-                continue
-                
-            if command[0].lower() == 'exit':
-                print("Goodbye!")
-                break
-                
-            elif command[0].lower() == 'list':
-                list_pages(fetcher)
-                
-            elif command[0].lower() == 'show' and len(command) > 1:
-                show_page(fetcher, command[1])
-                
-            else:
-                print("\nAvailable commands:")
-                print("  list              - List all pages in the space")
-                print("  show <page-id>    - Show content of a specific page")
-                print("  exit              - Exit the program")
-                
-        except KeyboardInterrupt:
-            print("\nGoodbye!")
-            break
-        except Exception as e:
-            print(f"Error: {str(e)}")
+
 
 def main():
     """Main entry point for the CLI."""
@@ -210,5 +212,4 @@ def main():
     return 0
 
 if __name__ == "__main__":
-    import sys
     sys.exit(main())
@@ -5,67 +5,299 @@ This module provides asynchronous functionality to validate URLs based on their
 """
 import aiohttp
 import asyncio
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Tuple, Callable, Optional, AsyncIterator
 import logging
-from functools import lru_cache
+import re
+import time
 from datetime import datetime
-import json
+from enum import IntEnum
+import orjson
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Logging is configured by the host application
 logger = logging.getLogger(__name__)
 
+# Keys that mark an API error payload
+_ERROR_KEYS = ('error', 'errors')
+
+def _has_error(data: Any, depth: int = 3) -> bool:
+    """Check for an error key in a decoded payload, looking at most ``depth`` levels down."""
+    if depth <= 0:
+        return False
+    if isinstance(data, dict):
+        if any(key in data for key in _ERROR_KEYS):
+            return True
+        children = data.values()
+    elif isinstance(data, list):
+        children = data
+    else:
+        return False
+    return any(_has_error(child, depth - 1) for child in children
+               if isinstance(child, (dict, list)))
+
+# Fixed-width YYYY-MM-DD dates compare correctly as plain strings
+_YMD_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+def _coverage_periods(coverages: List[Dict[str, Any]]):
+    """Yield (start, end) date strings of coverage items with a well-formed period."""
+    for coverage in coverages:
+        try:
+            start_date = coverage['coveragePeriod']['start']
+            end_date = coverage['coveragePeriod']['end']
+            # Malformed dates are skipped, as failed parses were before
+            if _YMD_RE.fullmatch(start_date) and _YMD_RE.fullmatch(end_date):
+                yield start_date, end_date
+        except (KeyError, TypeError):
+            continue
+
+def _accum_segments(plan_benefits: List[Dict[str, Any]]):
+    """Yield every benefitMaximum and memberCostComponent entry, plan by plan."""
+    for plan_benefit in plan_benefits:
+        try:
+            benefit_info = plan_benefit['planLevelBenefitInfo']
+        except (KeyError, TypeError):
+            continue
+        
+        # Check benefitMaximums
+        try:
+            benefit_maximums = benefit_info['benefitMaximums']['benefitMaximum']
+        except (KeyError, TypeError):
+            benefit_maximums = ()
+        yield from benefit_maximums
+        
+        # Check memberCostComponent
+        try:
+            cost_components = benefit_info['memberCost']['memberCostComponent']
+        except (KeyError, TypeError):
+            cost_components = ()
+        yield from cost_components
+
+def _error_key_details(data: Any) -> Optional[str]:
+    """Failure details for payloads carrying an error key."""
+    return 'Error found in API response' if _has_error(data) else None
+
+def _operation_outcome_details(data: Dict[str, Any]) -> Optional[str]:
+    """Failure details for accums payloads whose operationOutcome reports an error."""
+    error_text = _operation_outcome_error(data)
+    return None if error_text is None else f"Error in operation outcome: {error_text}"
+
+# Keys every accums segment must carry
+_AMOUNT_KEYS = frozenset(('remainingAmount', 'amount'))
+
+def _amounts_present(plan_benefits: List[Dict[str, Any]]) -> bool:
+    """Check that every accums segment has both amount keys.
+    
+    The keys-view comparison tests both keys in one C-level call per segment.
+    """
+    return all(
+        isinstance(segment, dict) and segment.keys() >= _AMOUNT_KEYS
+        for segment in _accum_segments(plan_benefits)
+    )
+
+def _operation_outcome_error(data: Dict[str, Any]):
+    """Return the first operationOutcome issue detail text mentioning an error, if any."""
+    issues = data.get('operationOutcome', {}).get('issue')
+    if not isinstance(issues, list):
+        return None
+    for issue in issues:
+        details = issue.get('details')
+        if not isinstance(details, list):
+            continue
+        for detail in details:
+            text = detail.get('text')
+            if isinstance(text, str) and 'error' in text.lower():
+                return text
+    return None
+
+class URLKind(IntEnum):
+    """Validation route for a URL, resolved once from its url_type string."""
+    GENERIC = 0
+    COVERAGE = 1
+    MEMBER = 2
+    ACCUMS = 3
+
+# URL type substrings and their kinds, checked in order
+_URL_KINDS = (
+    ('coveragev3', URLKind.COVERAGE),
+    ('memberv3', URLKind.MEMBER),
+    ('accums', URLKind.ACCUMS),
+)
+
+def _classify(url_type: Optional[str]) -> URLKind:
+    """Map a free-form url_type onto a URLKind."""
+    url_type = (url_type or '').lower()
+    for key, kind in _URL_KINDS:
+        if key in url_type:
+            return kind
+    return URLKind.GENERIC
+
+class _TokenBucket:
+    """Token-bucket rate limiter: waits only when the per-second budget is spent."""
+    
+    def __init__(self, rate: float):
+        if rate <= 0:
+            raise ValueError(f"requests_per_second must be positive, got {rate}")
+        self.rate = rate
+        # Hold at least one token so rates below 1/s can still be granted
+        self.capacity = max(rate, 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+    
+    async def acquire(self) -> None:
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
 class AsyncURLValidator:
     """Asynchronously validates URLs based on their type."""
     
-    def __init__(self, max_concurrent_requests: int = 10, timeout: int = 10):
+    def __init__(self, max_concurrent_requests: int = 10, timeout: int = 10,
+                 keep_response_data: bool = False, max_redirects: int = 3,
+                 max_response_bytes: int = 5 * 1024 * 1024,
+                 requests_per_second: Optional[float] = None):
         """Initialize the async URL validator.
         
         Args:
             max_concurrent_requests: Maximum number of concurrent HTTP requests
             timeout: Request timeout in seconds
+            keep_response_data: Attach the parsed API payload to each result.
+                Off by default so large payloads are freed once validated.
+            max_redirects: Maximum redirects followed per request
+            max_response_bytes: Largest API payload read before the URL is
+                reported as 'Response too large'
+            requests_per_second: Optional cap on the request rate; by default
+                only concurrency is limited
         """
+        self._limiter = _TokenBucket(requests_per_second) if requests_per_second else None
+        self.keep_response_data = keep_response_data
+        self.max_redirects = max_redirects
+        self.max_response_bytes = max_response_bytes
+        self.max_concurrent_requests = max_concurrent_requests
         self.semaphore = asyncio.Semaphore(max_concurrent_requests)
         self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self._session = None
+        self._handlers = {
+            URLKind.GENERIC: self._validate_generic_url,
+            URLKind.COVERAGE: self._validate_coveragev3_url,
+            URLKind.MEMBER: self._validate_memberv3_url,
+            URLKind.ACCUMS: self._validate_accums_url,
+        }
+    
+    async def __aenter__(self) -> 'AsyncURLValidator':
+        await self.start()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+    
+    async def start(self) -> None:
+        """Open the shared HTTP session; its connections are kept alive between validations."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_concurrent_requests,
+                limit_per_host=self.max_concurrent_requests,
+                ttl_dns_cache=300,
+                keepalive_timeout=60
+            )
+            self._session = aiohttp.ClientSession(timeout=self.timeout, connector=connector)
+    
+    async def close(self) -> None:
+        """Close the shared HTTP session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
         
     async def validate_urls(self, url_data: List[Tuple[str, str, str]]) -> List[Dict[str, Any]]:
         """Validate multiple URLs concurrently.
         
+        Uses the session opened by ``async with validator`` (or ``start()``);
+        without one, a session is opened for this call only.
+        
         Args:
             url_data: List of tuples containing (url, url_type, ticket_number)
             
         Returns:
-            List of validation results
+            List of validation results, one per entry in url_data and in the same order
         """
-        async with aiohttp.ClientSession(timeout=self.timeout) as session:
-            tasks = [self._validate_single_url(session, url, url_type, ticket) 
-                    for url, url_type, ticket in url_data]
-            
-            # Process in chunks to avoid overwhelming the server
-            chunk_size = self.semaphore._value  # Get the semaphore value
-            results = []
+        if self._session is None:
+            async with self:
+                return await self.validate_urls(url_data)
+        
+        gathered = {}
+        async for key, result in self._validate_groups(url_data):
+            gathered[key] = result
+        
+        # Fan each result out to every ticket, aligned with url_data
+        return [self._ticket_result(gathered[(url, url_type)], url, ticket)
+                for url, url_type, ticket in url_data]
+    
+    async def iter_validate_urls(self, url_data: List[Tuple[str, str, str]]) -> AsyncIterator[Dict[str, Any]]:
+        """Validate multiple URLs concurrently, yielding results as they finish.
+        
+        Results arrive in completion order rather than input order, so callers
+        can start processing after the fastest response instead of the slowest.
+        
+        Args:
+            url_data: List of tuples containing (url, url_type, ticket_number)
             
-            for i in range(0, len(tasks), chunk_size):
-                chunk = tasks[i:i + chunk_size]
-                chunk_results = await asyncio.gather(*chunk, return_exceptions=True)
-                
-                # Process results
-                for result in chunk_results:
-                    if isinstance(result, Exception):
-                        logger.error(f"Error during validation: {str(result)}")
-                        continue
-                    results.append(result)
-                
-                # Small delay between chunks
-                if i + chunk_size < len(tasks):
-                    await asyncio.sleep(0.1)
-                    
-            return results
+        Yields:
+            One validation result per entry in url_data
+        """
+        if self._session is None:
+            async with self:
+                async for result in self.iter_validate_urls(url_data):
+                    yield result
+            return
+        
+        tickets = {}
+        for url, url_type, ticket in url_data:
+            tickets.setdefault((url, url_type), []).append(ticket)
+        
+        async for (url, url_type), result in self._validate_groups(url_data):
+            for ticket in tickets[(url, url_type)]:
+                yield self._ticket_result(result, url, ticket)
+    
+    async def _validate_groups(self, url_data: List[Tuple[str, str, str]]):
+        """Validate each distinct (url, url_type) once, yielding (key, result) as each finishes.
+        
+        Tickets often share a URL, so each pair is requested only once. The
+        result is an exception if the validation task itself failed.
+        """
+        session = self._session
+        unique = {}
+        for url, url_type, ticket in url_data:
+            unique.setdefault((url, url_type), ticket)
+        
+        async def run(key, ticket):
+            try:
+                return key, await self._validate_single_url(session, key[0], _classify(key[1]), ticket)
+            except Exception as e:
+                return key, e
+        
+        # Submit everything at once; the semaphore and the connector limits
+        # keep at most max_concurrent_requests in flight
+        for next_done in asyncio.as_completed([run(key, ticket) for key, ticket in unique.items()]):
+            yield await next_done
+    
+    def _ticket_result(self, result: Any, url: str, ticket: str) -> Dict[str, Any]:
+        """Copy a group's result for one ticket; a failed task becomes an error result."""
+        if isinstance(result, Exception):
+            logger.error("Error during validation of %s: %s", url, result)
+            return self._create_result(ticket, False, 'Validation Error', repr(result))
+        return {**result, 'ticket': ticket}
     
     async def _validate_single_url(self, session: aiohttp.ClientSession, 
-                                 url: str, url_type: str, ticket: str) -> Dict[str, Any]:
+                                 url: str, kind: URLKind, ticket: str) -> Dict[str, Any]:
         """Validate a single URL with rate limiting."""
         async with self.semaphore:  # This limits concurrency
+            if self._limiter is not None:
+                await self._limiter.acquire()
             try:
                 if not url or not url.strip():
                     return self._create_result(ticket, False, 'Missing URL', 'URL is empty')
@@ -74,17 +306,10 @@ class AsyncURLValidator:
                     return self._create_result(ticket, False, 'Invalid URL', 'URL must start with http:// or https://')
                 
                 # Route to the appropriate validation method
-                if url_type and 'coveragev3' in url_type.lower():
-                    return await self._validate_coveragev3_url(session, url, ticket)
-                elif url_type and 'memberv3' in url_type.lower():
-                    return await self._validate_memberv3_url(session, url, ticket)
-                elif url_type and 'accums' in url_type.lower():
-                    return await self._validate_accums_url(session, url, ticket)
-                else:
-                    return await self._validate_generic_url(session, url, ticket)
+                return await self._handlers[kind](session, url, ticket)
                     
             except Exception as e:
-                logger.error(f"Error validating URL {url}: {str(e)}")
+                logger.error("Error validating URL %s: %s", url, e)
                 return self._create_result(ticket, False, 'Validation Error', str(e))
     
     @staticmethod
@@ -99,18 +324,31 @@ class AsyncURLValidator:
             'response_data': response_data
         }
     
+    def _retained(self, response_data: Any) -> Any:
+        """Return the payload to attach to a result, or None when not keeping payloads."""
+        return response_data if self.keep_response_data else None
+    
     async def _validate_generic_url(self, session: aiohttp.ClientSession, 
                                   url: str, ticket: str) -> Dict[str, Any]:
-        """Validate a generic URL."""
+        """Validate a generic URL.
+        
+        Only the status is inspected, so a HEAD request is sent; servers that
+        do not allow HEAD get a GET whose body is never read.
+        """
         try:
-            async with session.get(url, allow_redirects=True) as response:
-                if response.status == 200:
-                    return self._create_result(
-                        ticket, True, 'Active', 'URL is accessible (200 OK)')
-                else:
-                    return self._create_result(
-                        ticket, False, f'HTTP {response.status}', 
-                        f'Received status code: {response.status}')
+            async with session.head(url, allow_redirects=True, max_redirects=self.max_redirects) as response:
+                status = response.status
+            if status in (405, 501):
+                async with session.get(url, allow_redirects=True, max_redirects=self.max_redirects) as response:
+                    status = response.status
+            
+            if status == 200:
+                return self._create_result(
+                    ticket, True, 'Active', 'URL is accessible (200 OK)')
+            else:
+                return self._create_result(
+                    ticket, False, f'HTTP {status}', 
+                    f'Received status code: {status}')
                         
         except asyncio.TimeoutError:
             return self._create_result(
@@ -119,6 +357,65 @@ class AsyncURLValidator:
             return self._create_result(
                 ticket, False, 'Connection Error', str(e))
     
+    async def _read_capped(self, response: aiohttp.ClientResponse) -> Optional[bytes]:
+        """Read a response body, or return None once it exceeds max_response_bytes."""
+        limit = self.max_response_bytes
+        if response.content_length is not None and response.content_length > limit:
+            return None
+        
+        chunks = []
+        size = 0
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            size += len(chunk)
+            if size > limit:
+                return None
+            chunks.append(chunk)
+        return b''.join(chunks)
+    
+    async def _fetch_json(self, session: aiohttp.ClientSession, url: str, ticket: str,
+                          api_label: str, find_error: Callable[[Any], Optional[str]]):
+        """GET a typed API URL, decode its JSON body and check it for API errors.
+        
+        Args:
+            session: aiohttp ClientSession for making HTTP requests
+            url: The URL to fetch
+            ticket: The ticket number for this validation
+            api_label: API name used in the failure status (e.g. 'coverage')
+            find_error: Returns failure details for an error payload, None otherwise
+            
+        Returns:
+            Tuple of (response_data, None) on success, or (None, failure result)
+        """
+        # Make the API call
+        async with session.get(url, max_redirects=self.max_redirects) as response:
+            if response.status != 200:
+                return None, self._create_result(
+                    ticket, False,
+                    f'HTTP {response.status}',
+                    f'Received status code: {response.status}'
+                )
+            
+            # Read the raw body once, up to the size cap, and decode it directly
+            body = await self._read_capped(response)
+            if body is None:
+                return None, self._create_result(
+                    ticket, False,
+                    'Response too large',
+                    f'Response body exceeds {self.max_response_bytes} bytes'
+                )
+            response_data = orjson.loads(body)
+        
+        # Check for error in response
+        error_details = find_error(response_data)
+        if error_details is not None:
+            return None, self._create_result(
+                ticket, False,
+                f'failure from {api_label} API',
+                error_details,
+                self._retained(response_data)
+            )
+        return response_data, None
+    
     async def _validate_coveragev3_url(self, session: aiohttp.ClientSession, 
                                      url: str, ticket: str) -> Dict[str, Any]:
         """Validate a coveragev3 URL.
@@ -132,71 +429,44 @@ class AsyncURLValidator:
             Dict containing validation results with keys: valid, status, details
         """
         try:
-            # Make the API call
-            async with session.get(url) as response:
-                if response.status != 200:
-                    return self._create_result(
-                        ticket, False,
-                        f'HTTP {response.status}',
-                        f'Received status code: {response.status}'
-                    )
-                
-                # Check for error in response
-                response_data = await response.json()
-                if 'error' in str(response_data).lower():
-                    return self._create_result(
-                        ticket, False,
-                        'failure from coverage API',
-                        'Error found in API response',
-                        response_data
-                    )
-                
-                status_parts = ['success calling coverage API']
-                
-                # Check 1: Verify masterRecordID exists in all coverage items
-                mrid_missing = False
-                if 'coverages' in response_data and isinstance(response_data['coverages'], list):
-                    for coverage in response_data['coverages']:
-                        if 'businessIdentifier' not in coverage or 'masterRecordID' not in coverage['businessIdentifier']:
-                            mrid_missing = True
-                            break
-                
-                status_parts.append('mrid missing' if mrid_missing else 'mrid present')
-                
-                # Check 2: Check for active coverage period
-                active_coverage = False
-                current_date = datetime.now().date()
-                
-                if 'coverages' in response_data and isinstance(response_data['coverages'], list):
-                    for coverage in response_data['coverages']:
-                        if 'coveragePeriod' in coverage:
-                            try:
-                                start_date = datetime.strptime(
-                                    coverage['coveragePeriod']['start'], '%Y-%m-%d'
-                                ).date()
-                                end_date = datetime.strptime(
-                                    coverage['coveragePeriod']['end'], '%Y-%m-%d'
-                                ).date()
-                                
-                                if start_date <= current_date <= end_date:
-                                    active_coverage = True
-                                    break
-                            except (ValueError, KeyError, TypeError):
-                                # If date parsing fails, skip this coverage item
-                                continue
-                
-                status_parts.append('active coverage present' if active_coverage else 'active coverage missing')
-                
-                # Prepare final status
-                final_status = ' | '.join(status_parts)
-                
-                return self._create_result(
-                    ticket,
-                    not mrid_missing and active_coverage,
-                    final_status,
-                    'Coverage validation completed',
-                    response_data
-                )
+            response_data, failure = await self._fetch_json(
+                session, url, ticket, 'coverage', _error_key_details)
+            if failure is not None:
+                return failure
+            
+            status_parts = ['success calling coverage API']
+            
+            coverages = response_data.get('coverages')
+            if not isinstance(coverages, list):
+                coverages = []
+            
+            # Check 1: Verify masterRecordID exists in all coverage items
+            mrid_missing = not all(
+                'masterRecordID' in coverage.get('businessIdentifier', ())
+                for coverage in coverages
+            )
+            
+            status_parts.append('mrid missing' if mrid_missing else 'mrid present')
+            
+            # Check 2: Check for active coverage period
+            today = datetime.now().strftime('%Y-%m-%d')
+            active_coverage = any(
+                start <= today <= end
+                for start, end in _coverage_periods(coverages)
+            )
+            
+            status_parts.append('active coverage present' if active_coverage else 'active coverage missing')
+            
+            # Prepare final status
+            final_status = ' | '.join(status_parts)
+            
+            return self._create_result(
+                ticket,
+                not mrid_missing and active_coverage,
+                final_status,
+                'Coverage validation completed',
+                self._retained(response_data)
+            )
                 
         except Exception as e:
             return self._create_result(
@@ -215,47 +485,32 @@ class AsyncURLValidator:
             Dict containing validation results with keys: valid, status, details
         """
         try:
-            # Make the API call
-            async with session.get(url) as response:
-                if response.status != 200:
-                    return self._create_result(
-                        ticket, False,
-                        f'HTTP {response.status}',
-                        f'Received status code: {response.status}'
-                    )
-                
-                # Check for error in response
-                response_data = await response.json()
-                if 'error' in str(response_data).lower():
-                    return self._create_result(
-                        ticket, False,
-                        'failure from member API',
-                        'Error found in API response',
-                        response_data
-                    )
-                
-                status_parts = ['success calling member API']
-                
-                # Check 1: Verify masterRecordID exists in all member items
-                mrid_missing = False
-                if 'members' in response_data and isinstance(response_data['members'], list):
-                    for member in response_data['members']:
-                        if 'masterRecordID' not in member or not member['masterRecordID']:
-                            mrid_missing = True
-                            break
-                
-                status_parts.append('mrid missing' if mrid_missing else 'mrid present')
-                
-                # Prepare final status
-                final_status = ' | '.join(status_parts)
-                
-                return self._create_result(
-                    ticket,
-                    not mrid_missing,
-                    final_status,
-                    'Member validation completed',
-                    response_data
-                )
+            response_data, failure = await self._fetch_json(
+                session, url, ticket, 'member', _error_key_details)
+            if failure is not None:
+                return failure
+            
+            status_parts = ['success calling member API']
+            
+            members = response_data.get('members')
+            if not isinstance(members, list):
+                members = []
+            
+            # Check 1: Verify masterRecordID exists in all member items
+            mrid_missing = not all(member.get('masterRecordID') for member in members)
+            
+            status_parts.append('mrid missing' if mrid_missing else 'mrid present')
+            
+            # Prepare final status
+            final_status = ' | '.join(status_parts)
+            
+            return self._create_result(
+                ticket,
+                not mrid_missing,
+                final_status,
+                'Member validation completed',
+                self._retained(response_data)
+            )
                 
         except Exception as e:
             return self._create_result(
@@ -274,75 +529,31 @@ class AsyncURLValidator:
             Dict containing validation results with keys: valid, status, details
         """
         try:
-            # Make the API call
-            async with session.get(url) as response:
-                if response.status != 200:
-                    return self._create_result(
-                        ticket, False,
-                        f'HTTP {response.status}',
-                        f'Received status code: {response.status}'
-                    )
-                
-                # Parse the response
-                response_data = await response.json()
-                
-                # Check 1: Check for errors in operationOutcome
-                if 'operationOutcome' in response_data:
-                    operation_outcome = response_data['operationOutcome']
-                    if 'issue' in operation_outcome and isinstance(operation_outcome['issue'], list):
-                        for issue in operation_outcome['issue']:
-                            if 'details' in issue and isinstance(issue['details'], list):
-                                for detail in issue['details']:
-                                    if 'text' in detail and 'error' in str(detail['text']).lower():
-                                        return self._create_result(
-                                            ticket, False,
-                                            'failure from accums API',
-                                            f"Error in operation outcome: {detail['text']}",
-                                            response_data
-                                        )
-                
-                status_parts = ['success calling accums API']
-                amount_check_passed = True
-                
-                # Check 2: Validate amounts in planBenefitsAndAccums
-                if 'planBenefitsAndAccums' in response_data and isinstance(response_data['planBenefitsAndAccums'], list):
-                    for plan_benefit in response_data['planBenefitsAndAccums']:
-                        # Check benefitMaximums
-                        if ('planLevelBenefitInfo' in plan_benefit and 
-                            'benefitMaximums' in plan_benefit['planLevelBenefitInfo'] and
-                            'benefitMaximum' in plan_benefit['planLevelBenefitInfo']['benefitMaximums']):
-                            
-                            for benefit_max in plan_benefit['planLevelBenefitInfo']['benefitMaximums']['benefitMaximum']:
-                                if 'remainingAmount' not in benefit_max or 'amount' not in benefit_max:
-                                    amount_check_passed = False
-                                    break
-                        
-                        # Check memberCostComponent
-                        if (amount_check_passed and 
-                            'planLevelBenefitInfo' in plan_benefit and 
-                            'memberCost' in plan_benefit['planLevelBenefitInfo'] and
-                            'memberCostComponent' in plan_benefit['planLevelBenefitInfo']['memberCost']):
-                            
-                            for cost_component in plan_benefit['planLevelBenefitInfo']['memberCost']['memberCostComponent']:
-                                if 'remainingAmount' not in cost_component or 'amount' not in cost_component:
-                                    amount_check_passed = False
-                                    break
-                        
-                        if not amount_check_passed:
-                            break
-                
-                status_parts.append('amount present in all segments' if amount_check_passed else 'amount missing in any or all segment')
-                
-                # Prepare final status
-                final_status = ' | '.join(status_parts)
-                
-                return self._create_result(
-                    ticket,
-                    amount_check_passed,
-                    final_status,
-                    'Accums validation completed',
-                    response_data
-                )
+            # Check 1: Check for errors in operationOutcome
+            response_data, failure = await self._fetch_json(
+                session, url, ticket, 'accums', _operation_outcome_details)
+            if failure is not None:
+                return failure
+            
+            status_parts = ['success calling accums API']
+            # Check 2: Validate amounts in planBenefitsAndAccums
+            plan_benefits = response_data.get('planBenefitsAndAccums')
+            amount_check_passed = True
+            if isinstance(plan_benefits, list):
+                amount_check_passed = _amounts_present(plan_benefits)
+            
+            status_parts.append('amount present in all segments' if amount_check_passed else 'amount missing in any or all segment')
+            
+            # Prepare final status
+            final_status = ' | '.join(status_parts)
+            
+            return self._create_result(
+                ticket,
+                amount_check_passed,
+                final_status,
+                'Accums validation completed',
+                self._retained(response_data)
+            )
                 
         except Exception as e:
             return self._create_result(
@@ -2,37 +2,55 @@ import streamlit as st
 import os
 import re
 import time
-import json
-import pandas as pd
 import hashlib
+import hmac
+import itertools
 from datetime import datetime
+from types import MappingProxyType
 from dotenv import load_dotenv
-from pprint import pprint
-from main import initialize_system
-from rag_chain import query_rag_chain
 import incident_service
-import sys
-from atlassian import Confluence
 from typing import Optional, List, Dict, Any, Tuple
-import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
 
-# Initialize RAG system once when the app starts
+# Log level comes from LOG_LEVEL; DEBUG also logs retrieval tracing and raw
+# chain responses
+logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO').upper())
+logger = logging.getLogger(__name__)
+
+@st.cache_resource(show_spinner=False)
+def _load_env() -> bool:
+    """Read .env into os.environ once per process rather than on every rerun."""
+    load_dotenv()
+    return True
+
+# Load environment variables
+_load_env()
+
+# Initialize RAG system once per server process and share it across sessions
 @st.cache_resource(show_spinner=False)
-def get_rag_system():
+def get_rag_system(_reload_data: bool = False):
     """Initialize and cache the RAG system.
     
-    This function will only run once when the app starts or when the cache is cleared.
+    This function will only run once per server process (or when the cache is
+    cleared); every browser session reuses the same chain object.
+    
+    Args:
+        _reload_data: Reload the source data into the index while building.
+            Not part of the cache key, so clear the cache first to force a
+            rebuild; the reloaded chain then serves every later call.
     """
-    with st.spinner("Initializing RAG system..."):
-        return initialize_system()
+    # Imported here so the langchain/pinecone stack loads with the chain
+    from main import initialize_system
+    with st.spinner("Initializing AI system..."):
+        return initialize_system(reload_data=_reload_data)
 
-# Initialize the RAG system when the module loads
-rag_chain = get_rag_system()
 
-
-def update_confluence_table(confluence_table, row_index, column_name, new_value):
+def queue_cell_update(confluence_table, row_index, column_name, new_value):
     """
-    Update a cell in a Confluence table.
+    Update a cell of a Confluence table in memory.
+    
+    The change is sent to Confluence by the next flush_confluence_updates call.
     
     Args:
         confluence_table: The Confluence table object
@@ -53,7 +71,23 @@ def update_confluence_table(confluence_table, row_index, column_name, new_value)
             st.error(f"Failed to update {column_name} for row {row_index}")
             return False
         
-        # Save changes to Confluence
+        return True
+        
+    except Exception as e:
+        st.error(f"Error updating Confluence: {str(e)}")
+        return False
+
+def flush_confluence_updates(confluence_table):
+    """
+    Save all queued cell updates to Confluence in a single page update.
+    
+    Args:
+        confluence_table: The Confluence table object
+        
+    Returns:
+        bool: True if the save was successful, False otherwise
+    """
+    try:
         if not confluence_table.save_changes():
             st.error("Failed to save changes to Confluence")
             return False
@@ -63,124 +97,6 @@ def update_confluence_table(confluence_table, row_index, column_name, new_value)
     except Exception as e:
         st.error(f"Error updating Confluence: {str(e)}")
         return False
-st.markdown("""
-<style>
-    /* Main container */
-    html, body, .main {
-        font-size: 80% !important;
-    }
-    
-    .main {
-        max-width: 900px;
-        margin: 0 auto;
-        padding: 1rem;
-    }
-    
-    /* Chat container */
-    .chat-container {
-        display: flex;
-        flex-direction: column;
-        height: 80vh;
-        max-height: 80vh;
-        overflow-y: auto;
-        padding: 1rem;
-        scroll-behavior: smooth;
-    }
-    
-    /* Message bubbles */
-    .message {
-        padding: 0.75rem 1rem;
-        border-radius: 1.2rem;
-        margin: 0.25rem 0;
-        max-width: 80%;
-        line-height: 1.4;
-        position: relative;
-        box-shadow: 0 1px 2px rgba(0,0,0,0.1);
-        color: #333333;  /* Dark gray text for better readability */
-    }
-    
-    .user-message {
-        background-color: #f0f7ff;
-        margin-left: auto;
-        border-bottom-right-radius: 0.2rem;
-        box-shadow: 0 1px 2px rgba(0,0,0,0.1);
-    }
-    
-    .assistant-message {
-        background-color: #f5f5f5;
-        margin-right: auto;
-        border-bottom-left-radius: 0.3rem;
-        color: #333333;  /* Ensure text is visible on light gray background */
-    }
-    
-    /* Input area */
-    .stTextInput>div>div>input {
-        border-radius: 1.5rem !important;
-        padding: 0.9rem 1.2rem !important;
-        font-size: 1.05rem !important;
-        box-shadow: 0 2px 15px rgba(0,0,0,0.1) !important;
-        border: 1px solid #e0e0e0 !important;
-    }
-    
-    /* Sidebar */
-    .sidebar .sidebar-content {
-        background-color: #f8f9fa;
-        border-right: 1px solid #eaeaea;
-    }
-    
-    /* Sidebar headers */
-    .sidebar .stMarkdown h3 {
-        font-size: 1.1rem !important;
-    }
-    
-    /* Typing indicator */
-    .typing {
-        display: inline-block;
-        padding: 0.5rem 1rem;
-    }
-    
-    .typing-dot {
-        height: 8px;
-        width: 8px;
-        background-color: #bbb;
-        border-radius: 50%;
-        display: inline-block;
-        margin: 0 2px;
-        animation: typing 1.4s infinite ease-in-out both;
-    }
-    
-    .typing-dot:nth-child(1) { animation-delay: 0s; }
-    .typing-dot:nth-child(2) { animation-delay: 0.2s; }
-    .typing-dot:nth-child(3) { animation-delay: 0.4s; }
-    
-    @keyframes typing {
-        0%, 80%, 100% { transform: scale(0); }
-        40% { transform: scale(1); }
-    }
-    
-    /* Custom scrollbar */
-    ::-webkit-scrollbar {
-        width: 6px;
-    }
-    
-    ::-webkit-scrollbar-track {
-        background: #f1f1f1;
-        border-radius: 10px;
-    }
-    
-    ::-webkit-scrollbar-thumb {
-        background: #888;
-        border-radius: 10px;
-    }
-    
-    ::-webkit-scrollbar-thumb:hover {
-        background: #555;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-# Load environment variables
-load_dotenv()
 
 # Set page config
 st.set_page_config(
@@ -190,42 +106,187 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-def display_typing_indicator():
-    """Display a typing indicator"""
-    return """
-    <div class="typing">
-        <span class="typing-dot"></span>
-        <span class="typing-dot"></span>
-        <span class="typing-dot"></span>
-    </div>
+# Stylesheet shared by every tab, kept as a static asset
+CSS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "chat_ui.css")
+
+@st.cache_data(show_spinner=False)
+def load_css() -> str:
+    """Read the app stylesheet once per process."""
+    with open(CSS_PATH, encoding="utf-8") as f:
+        return f.read()
+
+def _require_response(response, what: str):
+    """Return a service response, raising instead when the call failed.
+    
+    incident_service reports failures as None or an {"error": ...} dict;
+    raising keeps st.cache_data from serving them to every session.
     """
+    if response is None:
+        raise RuntimeError(f"Could not fetch {what}")
+    if isinstance(response, dict) and "error" in response:
+        raise RuntimeError(f"Could not fetch {what}: {response['error']}")
+    return response
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_incidents():
+    """Fetch the incident list, shared across sessions for up to a minute."""
+    return _require_response(incident_service.fetch_incidents(), "incidents")
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_tagged_incidents():
+    """Fetch the ODS/ICAD-tagged incidents, shared across sessions for up to a minute."""
+    return _require_response(incident_service.fetch_incidents_by_tag(), "tagged incidents")
+
+# ServiceNow fields shown in the ODS/ICAD tables and their column titles
+TAGGED_TABLE_COLUMNS = {
+    'number': "Number",
+    'short_description': "Short Description",
+    'assignment_group': "Assignment Group",
+    'sys_created_on': "Created",
+    'description': "Description"
+}
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_ods_icad_incidents():
+    """Split the tagged incidents into (ODS, ICAD) display tables with vectorized tag matching."""
+    import pandas as pd
+    tagged_incidents = get_tagged_incidents()
+    df = pd.DataFrame((tagged_incidents or {}).get('result', []))
+    if df.empty or 'sys_tags' not in df:
+        empty = pd.DataFrame(columns=list(TAGGED_TABLE_COLUMNS.values()))
+        return empty, empty
+    # Project onto the display columns, filling fields the API left out
+    table = df.reindex(columns=list(TAGGED_TABLE_COLUMNS)).rename(columns=TAGGED_TABLE_COLUMNS)
+    # An incident can carry both tags, so the masks may overlap
+    tags = df['sys_tags'].fillna('').astype(str)
+    ods = table[tags.str.contains('ODS', regex=False)]
+    icad = table[tags.str.contains('ICAD', regex=False)]
+    return ods, icad
+
+@st.cache_resource(show_spinner=False)
+def get_worker_pool() -> ThreadPoolExecutor:
+    """Worker threads for blocking service calls, shared by every session."""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="chat-ui-worker")
+
+@st.cache_resource(show_spinner=False)
+def get_query_embedder():
+    """The embedding model used for the index, reused to embed chat queries."""
+    from vector_store import get_embeddings
+    return get_embeddings()
+
+def _proximity_scope(prompt: str, search_mode: str) -> tuple:
+    """Cache scope for a query: answers are only shared for the same mode and incidents."""
+    return search_mode, tuple(sorted(set(re.findall(r'INC\d+', prompt.upper()))))
+
+# Columns shown in the incident table, in display order
+INCIDENT_TABLE_COLUMNS = ["Number", "Description", "Status", "Created On"]
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_formatted_incidents():
+    """The incident list formatted as a display table (a DataFrame), cached alongside get_incidents."""
+    import pandas as pd
+    return pd.DataFrame(incident_service.format_incidents(get_incidents()),
+                        columns=INCIDENT_TABLE_COLUMNS)
+
+@st.cache_data(ttl=30, show_spinner=False)
+def get_incident_details(incident_number: str):
+    """Details for one incident, cached briefly so reopening it skips the API call."""
+    return _require_response(incident_service.get_incident_details(incident_number),
+                             f"details for {incident_number}")
+
+def invalidate_incidents():
+    """Drop cached incident data after a change so the next render refetches it."""
+    get_incidents.clear()
+    get_tagged_incidents.clear()
+    get_ods_icad_incidents.clear()
+    get_formatted_incidents.clear()
+    get_incident_details.clear()
+
+# Animated dots shown while the assistant reply is being prepared
+TYPING_INDICATOR_HTML = """
+<div class="typing">
+    <span class="typing-dot"></span>
+    <span class="typing-dot"></span>
+    <span class="typing-dot"></span>
+</div>
+"""
+
+# Number of chat messages rendered before "Load older" is needed
+CHAT_WINDOW = 30
+
+# Escaped newlines/quotes and dash bullets, normalized in a single pass
+_CLEAN_RE = re.compile(r'\\n|\\"|- ')
+_CLEAN_MAP = {'\\n': '\n', '\\"': '"', '- ': '• '}
+
+def _clean_markers(text: str) -> str:
+    """Replace escaped newlines/quotes and '- ' bullets in one regex pass."""
+    return _CLEAN_RE.sub(lambda m: _CLEAN_MAP[m.group()], text)
+
+def _clean_stream(chunks):
+    """Normalize escaped newlines/quotes and bullet markers in a token stream.
+    
+    Leading whitespace of the answer is dropped, so the joined output needs
+    no second cleanup pass.
+    """
+    pending = ''
+    started = False
+    for chunk in chunks:
+        text = pending + chunk
+        # Hold back a trailing '-' or '\\' so markers split across tokens are still caught
+        if text.endswith(('-', '\\')):
+            pending, text = text[-1], text[:-1]
+        else:
+            pending = ''
+        text = _clean_markers(text)
+        if not started:
+            text = text.lstrip()
+            started = bool(text)
+        if text:
+            yield text
+    if pending:
+        yield pending
+
+def _batched(chunks, interval_ms: int = 32):
+    """Merge stream chunks and yield them at most every interval_ms milliseconds."""
+    interval = interval_ms / 1000
+    buffer = []
+    last_flush = time.monotonic()
+    for chunk in chunks:
+        buffer.append(chunk)
+        now = time.monotonic()
+        if now - last_flush >= interval:
+            yield ''.join(buffer)
+            buffer.clear()
+            last_flush = now
+    if buffer:
+        yield ''.join(buffer)
+
+# Per-session UI state and its initial values
+SESSION_DEFAULTS = {
+    "search_type": "general",
+    "show_update_options": False,
+    "active_tab": "Incidents",
+    "rag_chain_initializing": False,
+    # Incident management
+    "show_details": False,
+    "selected_incident_number": None,
+    "rows_per_page": 10,
+    # Ticket creation
+    "new_ticket_number": None
+}
 
 def initialize_session_state():
     """Initialize session state variables"""
-    # Initialize messages list if it doesn't exist
-    if "messages" not in st.session_state:
-        st.session_state.messages = []
-    
-    # Track if we've initialized the RAG system in this session
-    if "rag_initialized" not in st.session_state:
-        st.session_state.rag_initialized = False
+    # Initialize messages list if it doesn't exist (a fresh list per session)
+    st.session_state.setdefault("messages", [])
     
-    # Initialize other UI state variables
-    default_values = {
-        "search_type": "general",
-        "show_ticket_details": False,
-        "show_view_ticket_button": False,
-        "ticket_short_description": "",
-        "ticket_description": "",
-        "show_update_options": False,
-        "active_tab": "Incidents",
-        "rag_chain_initializing": False
-    }
+    # The RAG chain is built on the first chat question (or from the admin
+    # controls), so a new session starts uninitialized
+    st.session_state.setdefault("rag_initialized", False)
     
     # Set default values for any missing keys
-    for key, default_value in default_values.items():
-        if key not in st.session_state:
-            st.session_state[key] = default_value
+    for key, default_value in SESSION_DEFAULTS.items():
+        st.session_state.setdefault(key, default_value)
 
 def render_ods_icad():
     """Render the ODS & ICAD section with tagged incidents"""
@@ -234,6 +295,8 @@ def render_ods_icad():
     
     # Add a refresh button with a unique key
     if st.button("🔄 Refresh Incidents", key="refresh_incidents_btn"):
+        get_tagged_incidents.clear()
+        get_ods_icad_incidents.clear()
         st.rerun()
     
     # Create two columns for ODS and ICAD incidents
@@ -242,20 +305,8 @@ def render_ods_icad():
     # Fetch all tagged incidents (both ODS and ICAD)
     with st.spinner("Loading incidents..."):
         try:
-            tagged_incidents = incident_service.fetch_incidents_by_tag()
-            
-            # Separate ODS and ICAD incidents
-            ods_incidents = []
-            icad_incidents = []
-            
-            if tagged_incidents and 'result' in tagged_incidents:
-                for incident in tagged_incidents['result']:
-                    # Check if the incident has ODS or ICAD tag
-                    if 'sys_tags' in incident and incident['sys_tags']:
-                        if 'ODS' in incident['sys_tags']:
-                            ods_incidents.append(incident)
-                        if 'ICAD' in incident['sys_tags']:
-                            icad_incidents.append(incident)
+            # Separated into ODS and ICAD incidents (cached with the fetch)
+            ods_incidents, icad_incidents = get_ods_icad_incidents()
             
         except Exception as e:
             st.error(f"Error loading incidents: {str(e)}")
@@ -264,27 +315,34 @@ def render_ods_icad():
     # Display ODS incidents
     with col1:
         st.subheader("🔵 ODS Incidents")
-        if ods_incidents:
-            for incident in ods_incidents:
-                with st.expander(f"{incident.get('number')}: {incident.get('short_description', 'No description')}"):
-                    st.write(f"**Assignment Group:** {incident.get('assignment_group', 'N/A')}")
-                    st.write(f"**Created:** {incident.get('sys_created_on', 'N/A')}")
-                    st.write(f"**Description:** {incident.get('description', 'No description available')}")
+        if not ods_incidents.empty:
+            st.dataframe(ods_incidents, use_container_width=True, hide_index=True)
         else:
             st.info("No ODS incidents found.")
     
     # Display ICAD incidents
     with col2:
         st.subheader("🟢 ICAD Incidents")
-        if icad_incidents:
-            for incident in icad_incidents:
-                with st.expander(f"{incident.get('number')}: {incident.get('short_description', 'No description')}"):
-                    st.write(f"**Assignment Group:** {incident.get('assignment_group', 'N/A')}")
-                    st.write(f"**Created:** {incident.get('sys_created_on', 'N/A')}")
-                    st.write(f"**Description:** {incident.get('description', 'No description available')}")
+        if not icad_incidents.empty:
+            st.dataframe(icad_incidents, use_container_width=True, hide_index=True)
         else:
             st.info("No ICAD incidents found.")
 
+# Hex digest of the admin password (default: 'password'); read once per run,
+# after .env has been loaded. Values prefixed with "blake2b:" are BLAKE2b-256
+# digests, bare values are SHA-256 digests as configured before
+ADMIN_PASSWORD_HASH = os.getenv("ADMIN_PASSWORD_HASH", "blake2b:344b8a854221bd1eaf9382daaea1996fbcd496f158e983f8835c7ef5084c55bb")
+
+def _admin_password_matches(password: str) -> bool:
+    """Check a password against ADMIN_PASSWORD_HASH in constant time."""
+    algorithm, _, expected = ADMIN_PASSWORD_HASH.rpartition(':')
+    if algorithm == 'blake2b':
+        hashed_password = hashlib.blake2b(password.encode(), digest_size=32).hexdigest()
+    else:
+        hashed_password = hashlib.sha256(password.encode()).hexdigest()
+    # Constant-time comparison so the check doesn't leak how much matched
+    return hmac.compare_digest(hashed_password, expected)
+
 def check_admin_auth():
     """Check if admin is authenticated"""
     if 'admin_authenticated' not in st.session_state:
@@ -302,10 +360,7 @@ def authenticate_admin():
         password = st.sidebar.text_input("Admin Password:", type="password", key="admin_pass")
         if st.sidebar.button("Authenticate"):
             # In production, use a proper password hashing mechanism
-            hashed_password = hashlib.sha256(password.encode()).hexdigest()
-            # Get password from environment variable or use a default for demonstration
-            admin_password_hash = os.getenv("ADMIN_PASSWORD_HASH", "5e884898da28047151d0e56f8dc6292773603d0d6aabbdd62a11ef721d1542d8")  # default: 'password'
-            if hashed_password == admin_password_hash:
+            if _admin_password_matches(password):
                 st.session_state.admin_authenticated = True
                 st.rerun()
             else:
@@ -313,6 +368,31 @@ def authenticate_admin():
         return False
     return True
 
+# Search modes understood by the RAG chain and how the selector labels them
+SEARCH_MODE_LABELS = MappingProxyType({
+    'general': "Looking for quick guide to resolve from past incident history?",
+    'incident_number': "Query with Incident Numbers if you have them handy",
+    'mmr_only': "For other query"
+})
+SEARCH_MODES = tuple(SEARCH_MODE_LABELS)
+
+@st.fragment
+def render_search_mode():
+    """Render the search mode selector.
+    
+    Runs as a fragment so switching modes only reruns this selector; the
+    chat reads st.session_state.search_type when the next query is sent.
+    """
+    # Search mode selection; the widget's value is the internal search type
+    st.markdown("### 🔍 Search Mode")
+    st.radio(
+        "Select search mode:",
+        SEARCH_MODES,
+        format_func=SEARCH_MODE_LABELS.get,
+        key="search_type",
+        label_visibility="collapsed"
+    )
+
 def render_sidebar():
     """Render the sidebar with controls"""
     # Initialize reload_data with default value
@@ -321,40 +401,7 @@ def render_sidebar():
     with st.sidebar:
         st.title("⚙️ Settings")
         
-        # Initialize search type in session state if not exists
-        if 'search_type' not in st.session_state:
-            st.session_state.search_type = 'general'
-        
-        # Get current search mode display text based on current search type
-        search_type_to_display = {
-            'general': "Looking for quick guide to resolve from past incident history?",
-            'incident_number': "Query with Incident Numbers if you have them handy",
-            'mmr_only': "For other query"
-        }
-        
-        # Search mode selection
-        st.markdown("### 🔍 Search Mode")
-        search_mode = st.radio(
-            "Select search mode:",
-            [
-                "Looking for quick guide to resolve from past incident history?",
-                "Query with Incident Numbers if you have them handy",
-                "For other query"
-            ],
-            index=["general", "incident_number", "mmr_only"].index(st.session_state.search_type),
-            key="search_type_display",
-            label_visibility="collapsed"
-        )
-        
-        # Map search mode to internal type
-        search_type_map = {
-            "Looking for quick guide to resolve from past incident history?": "general",
-            "Query with Incident Numbers if you have them handy": "incident_number",
-            "For other query": "mmr_only"
-        }
-        
-        # Update search type without clearing messages
-        st.session_state.search_type = search_type_map[search_mode]
+        render_search_mode()
         
         st.markdown("---")
         
@@ -380,8 +427,11 @@ def render_sidebar():
             if st.session_state.rag_chain_initializing and not st.session_state.rag_initialized:
                 with st.spinner("Initializing AI system (this may take a minute)..."):
                     try:
-                        rag_chain = initialize_system(reload_data=reload_data)
-                        if rag_chain:
+                        # Only rebuild when asked to; otherwise reuse the shared
+                        # chain, which costs no Pinecone calls once it is warm
+                        if reload_data:
+                            get_rag_system.clear()
+                        if get_rag_system(_reload_data=reload_data):
                             st.session_state.rag_initialized = True
                             st.session_state.rag_chain_initializing = False
                             st.rerun()
@@ -397,6 +447,9 @@ def render_sidebar():
             if st.session_state.rag_initialized:
                 st.success("✅ AI System Initialized")
                 if st.button("🔄 Reinitialize AI System", key="reinit_ai_system_btn"):
+                    # Drop the shared chain; it is rebuilt on the next
+                    # initialize or the next chat question, not here
+                    get_rag_system.clear()
                     st.session_state.rag_initialized = False
                     st.rerun()
                     
@@ -410,8 +463,13 @@ def render_sidebar():
             reload_data = False  # Ensure reload_data is defined in this branch
         return reload_data
 
+@st.fragment
 def render_chat():
-    """Render the chat interface"""
+    """Render the chat interface.
+    
+    Runs as a fragment so sending a message only reruns the chat area
+    instead of the whole app (sidebar, incident list, other tabs).
+    """
     # Header
     st.markdown("""
         <div style='text-align: center; margin: 1rem 0 2rem 0;'>
@@ -420,65 +478,24 @@ def render_chat():
         </div>
     """, unsafe_allow_html=True)
     
-    # Use the globally cached RAG chain
-    if not rag_chain:
-        st.error("Failed to initialize the AI system. Please restart the application.")
-        return
-        
-    # Store the rag_chain in session state for other functions to use
-    st.session_state.rag_chain = rag_chain
-    
     # Chat container
     chat_container = st.container()
     
-    # Display chat messages using st.chat_message for better state management
+    # Display chat messages using st.chat_message for better state management;
+    # only the most recent window is rendered, older ones load on demand
+    messages = st.session_state.messages
+    visible_count = st.session_state.setdefault('visible_count', CHAT_WINDOW)
     with chat_container:
-        for message in st.session_state.messages:
+        if len(messages) > visible_count:
+            if st.button(f"Load {CHAT_WINDOW} older messages", key="load_older_messages_btn"):
+                st.session_state.visible_count += CHAT_WINDOW
+                st.rerun(scope="fragment")
+        for message in messages[-visible_count:]:
+            # Plain markdown; the chat_message container provides the styling
             with st.chat_message(message["role"]):
-                st.markdown(f"""
-                    <div class='message {message["role"]}-message'>
-                        {message["content"]}
-                    </div>
-                """, unsafe_allow_html=True)
+                st.markdown(message["content"])
     
     # Chat input at the bottom using Streamlit's chat_input
-    st.markdown("""
-        <style>
-            .stChatFloatingInputContainer {
-                position: fixed;
-                bottom: 0;
-                left: 0;
-                right: 0;
-                background: white;
-                padding: 1rem;
-                box-shadow: 0 -2px 10px rgba(0,0,0,0.1);
-                z-index: 1000;
-            }
-            .message {
-                padding: 0.75rem 1rem;
-                border-radius: 1.2rem;
-                margin: 0.25rem 0;
-                max-width: 80%;
-                line-height: 1.4;
-                white-space: pre-wrap;
-                word-wrap: break-word;
-            }
-            .user-message {
-                background-color: #f0f7ff;
-                margin-left: auto;
-                border-bottom-right-radius: 0.2rem;
-                box-shadow: 0 1px 2px rgba(0,0,0,0.1);
-                color: #333333;
-            }
-            .assistant-message {
-                background-color: #f5f5f5;
-                margin-right: auto;
-                border-bottom-left-radius: 0.3rem;
-                color: #333333;
-            }
-        </style>
-    """, unsafe_allow_html=True)
-    
     if prompt := st.chat_input("Message Incident Assistant..."):
         # Skip empty queries
         if not prompt or not prompt.strip():
@@ -490,324 +507,375 @@ def render_chat():
         
         # Display user message
         with chat_container:
-            st.markdown(f"""
-                <div class='message-container user'>
-                    <div class='message user-message'>
-                        {prompt}
-                    </div>
-                </div>
-            """, unsafe_allow_html=True)
+            with st.chat_message("user"):
+                st.markdown(prompt)
         
         # Display assistant response
         with chat_container:
             message_placeholder = st.empty()
-            message_placeholder.markdown(display_typing_indicator(), unsafe_allow_html=True)
+            message_placeholder.markdown(TYPING_INDICATOR_HTML, unsafe_allow_html=True)
             
             try:
-                # Get response from RAG chain
-                response = query_rag_chain(
-                    st.session_state.rag_chain,
-                    prompt,
-                    search_mode=st.session_state.search_type
-                )
+                from rag_chain import stream_rag_chain
+                from proximity_cache import ProximityCache
                 
-                # Debug: Print the raw response
-                print("\n=== RAW RESPONSE FROM RAG CHAIN ===")
-                print(f"Type: {type(response)}")
-                print("Response content:")
-                pprint(response)
-                print("=" * 40, "\n")
+                # Near-duplicate questions are answered from the session's cache
+                if 'proximity_cache' not in st.session_state:
+                    st.session_state.proximity_cache = ProximityCache()
+                proximity_cache = st.session_state.proximity_cache
+                scope = _proximity_scope(prompt, st.session_state.search_type)
+                try:
+                    # Load the embedder (when cold) and embed the query on a
+                    # worker while the chain is fetched below
+                    embedding_future = get_worker_pool().submit(
+                        lambda: get_query_embedder().embed_query(prompt)
+                    )
+                except Exception as e:
+                    logger.warning("Could not embed query for the proximity cache: %s", e)
+                    embedding_future = None
                 
-                # Extract the response text, handling the nested dictionary structure
-                if isinstance(response, dict):
-                    # Handle the case where answer is a nested dictionary
-                    if 'answer' in response and isinstance(response['answer'], dict) and 'answer' in response['answer']:
-                        response_text = response['answer']['answer']
-                    # Handle the case where answer is a direct string
-                    elif 'answer' in response and isinstance(response['answer'], str):
-                        response_text = response['answer']
-                    # Fallback to string representation if structure is unexpected
-                    else:
-                        response_text = str(response)
-                else:
-                    response_text = str(response)
+                # The chain (and the langchain stack behind it) is only loaded
+                # once someone actually asks a question; a cold build overlaps
+                # the embedding request
+                rag_chain = get_rag_system()
+                if not rag_chain:
+                    raise RuntimeError("Failed to initialize the AI system. Please restart the application.")
+                st.session_state.rag_initialized = True
                 
-                # Clean up the response text
-                response_text = response_text.strip()
-                    
-                if isinstance(response_text, str):
-                    # First replace escaped newlines with actual newlines
-                    response_text = response_text.replace('\\n', '\n')
-                    # Ensure consistent bullet point formatting
-                    response_text = response_text.replace('- ', '• ')
-                    # Replace any remaining escaped quotes
-                    response_text = response_text.replace('\\"', '"')
-                    # Clean up any double newlines at the start
-                    response_text = response_text.lstrip('\n')
+                query_embedding = None
+                if embedding_future is not None:
+                    try:
+                        query_embedding = embedding_future.result()
+                    except Exception as e:
+                        logger.warning("Could not embed query for the proximity cache: %s", e)
+                cached_answer = None
+                if query_embedding is not None:
+                    cached_answer = proximity_cache.lookup(query_embedding, scope)
                 
-                # Clear the placeholder first
-                message_placeholder.empty()
+                # Filled in by stream_rag_chain; only model answers are cached
+                stream_status = {}
+                if cached_answer is not None:
+                    token_stream = iter([cached_answer])
+                else:
+                    # Retrieval happens on the first pull; the typing indicator
+                    # stays up until the model produces its first token
+                    token_stream = stream_rag_chain(
+                        rag_chain,
+                        prompt,
+                        search_mode=st.session_state.search_type,
+                        status=stream_status
+                    )
+                first_token = next(token_stream, '')
                 
-                # Create a container for the assistant's message
-                with message_placeholder.container():
-                    # Display the full response using Streamlit's markdown
-                    st.markdown("""
-                    <style>
-                    .message-container {
-                        display: flex;
-                        margin: 0.5rem 0;
-                    }
-                    
-                    .message-container.user {
-                        justify-content: flex-end;
-                    }
-                    
-                    .message-container.assistant {
-                        justify-content: flex-start;
-                    }
-                    
-                    .assistant-message {
-                        background-color: #f5f5f5;
-                        padding: 0.75rem 1rem;
-                        border-radius: 1.2rem;
-                        margin: 0.25rem 0;
-                        max-width: 80%;
-                        line-height: 1.4;
-                        color: #333333;
-                        border-bottom-left-radius: 0.3rem;
-                        white-space: pre-wrap;
-                        word-wrap: break-word;
-                    }
-                    </style>
-                    <div style='display: flex; justify-content: flex-start; margin: 0.5rem 0;'>
-                        <div class='assistant-message'>
-                    """, unsafe_allow_html=True)
-                    
-                    # Display the response text with proper formatting
-                    st.markdown(response_text)
-                    
-                    # Close the divs
-                    st.markdown("""
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
+                # Replace the typing indicator with the assistant's message,
+                # streamed as the model generates it
+                with message_placeholder.container(), st.chat_message("assistant"):
+                    response_text = st.write_stream(
+                        _batched(_clean_stream(itertools.chain([first_token], token_stream)))
+                    )
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("RAG response type=%s content=%r", type(response_text), response_text)
+                    # The stream was cleaned as it was written; only trailing space is left
+                    response_text = response_text.rstrip()
+                    if stream_status.get('error'):
+                        st.error(f"The response was interrupted: {stream_status['error']}")
+                
+                if (cached_answer is None and query_embedding is not None
+                        and response_text and stream_status.get('from_llm')):
+                    proximity_cache.insert(query_embedding, response_text, scope)
                 
                 # Add the full response to chat history
                 st.session_state.messages.append({"role": "assistant", "content": response_text})
                 
             except Exception as e:
                 error_msg = f"Sorry, I encountered an error: {str(e)}"
-                message_placeholder.markdown(f"""
-                    <div style='display: flex; justify-content: flex-start;'>
-                        <div class='message assistant-message error'>
-                            {error_msg}
-                        </div>
-                    </div>
-                """, unsafe_allow_html=True)
+                with message_placeholder.container(), st.chat_message("assistant"):
+                    st.markdown(error_msg)
                 st.session_state.messages.append({"role": "assistant", "content": error_msg})
+
+def _page_bounds(total: int, per_page: int, page: int) -> Tuple[int, int, int, int]:
+    """Clamp ``page`` and compute the slice for it.
+    
+    Returns:
+        (start_idx, end_idx, total_pages, page), with total_pages at least 1
+    """
+    total_pages = max(1, (total + per_page - 1) // per_page)
+    page = min(max(1, page), total_pages)
+    start_idx = (page - 1) * per_page
+    return start_idx, min(start_idx + per_page, total), total_pages, page
+
+def _current_page() -> int:
+    """Incident page from the ``?page=`` URL parameter, so it survives reloads and links."""
+    try:
+        return int(st.query_params.get("page", "1"))
+    except ValueError:
+        return 1
+
+def _set_page(page: int):
+    """Pagination button callback; runs before the rerun the click triggers."""
+    st.query_params["page"] = str(page)
+
+def _incident_updated():
+    """Close the details panel and refresh every incident view after a change.
+    
+    The cached list and details are cleared for all sessions, so the rerun
+    (and anyone else's next render) refetches them once. Dropping the selection
+    means that rerun skips the details panel instead of refetching it.
+    """
+    st.session_state.show_update_options = False
+    st.session_state.pop("selected_incident_number", None)
+    st.session_state.show_details = False
+    invalidate_incidents()
+    st.rerun()
+
+# Seconds between checks on an incident update running in the background
+UPDATE_POLL_INTERVAL = 0.3
+
+def _submit_update(incident_number: str, payload: Dict[str, Any], success_msg: str):
+    """Start an incident update on a worker thread and rerun the actions fragment.
+    
+    The fragment picks the result up through _update_status, so the form
+    submit returns without waiting on ServiceNow.
+    """
+    future = get_worker_pool().submit(incident_service.update_incident, incident_number, payload)
+    st.session_state[f"pending_update_{incident_number}"] = (future, success_msg)
+    st.rerun(scope="fragment")
+
+@st.fragment(run_every=UPDATE_POLL_INTERVAL)
+def _update_status(incident_number: str):
+    """Show the progress of a background update for ``incident_number``.
+    
+    Streamlit reruns this fragment every UPDATE_POLL_INTERVAL while it is
+    rendered, which is only while the update is pending. Once the update
+    finishes the app reruns: on success the details panel closes, on failure
+    the error is shown above the forms so they can be resubmitted.
+    """
+    key = f"pending_update_{incident_number}"
+    if key not in st.session_state:
+        return
+    future, success_msg = st.session_state[key]
+    if not future.done():
+        st.status("Updating incident...", state="running", expanded=False)
+        return
     
-    st.markdown("</div>", unsafe_allow_html=True)
+    del st.session_state[key]
+    try:
+        updated = future.result()
+    except Exception as e:
+        logger.error("Update of incident %s failed: %s", incident_number, e)
+        updated = False
+    if updated:
+        st.session_state.incident_update_notice = success_msg
+        _incident_updated()
+    else:
+        st.session_state[f"update_failed_{incident_number}"] = True
+        st.rerun()
 
+def _hold_form(incident_number: str, title: str, button_label: str,
+               success_msg: str, expanded: bool = False):
+    """Render the hold form inside an expander and submit it as an On Hold update.
+    
+    Args:
+        incident_number: Incident the form updates
+        title: Expander title
+        button_label: Submit button label
+        success_msg: Message shown once the update succeeds
+        expanded: Whether the expander starts open
+    """
+    with st.expander(title, expanded=expanded):
+        with st.form(f"hold_form_{incident_number}"):
+            hold_reason = st.text_input("Hold Reason", 
+                                     placeholder="Enter reason for hold",
+                                     key=f"hold_reason_{incident_number}")
+            work_notes = st.text_area("Work Notes",
+                                   placeholder="Enter work notes",
+                                   key=f"work_notes_{incident_number}")
+            submitted_hold = st.form_submit_button(button_label)
+            if submitted_hold and hold_reason and work_notes:
+                _submit_update(incident_number, {
+                    "state": "3",  # On Hold state
+                    "hold_reason": hold_reason,
+                    "work_notes": work_notes
+                }, success_msg)
+
+@st.fragment
+def _incident_actions(incident_number: str, current_state: str):
+    """Render the resolve/hold forms for the incident shown in the details panel.
+    
+    Runs as its own fragment so submitting an incomplete form, or expanding one,
+    only reruns the forms. A successful update reruns the app so the table and
+    details pick up the new state.
+    """
+    # Show update options if the update button was clicked
+    if st.session_state.get('show_update_options', False):
+        st.markdown("### Update Options")
+        # Progress for whichever form is submitted, polled only while it runs
+        if f"pending_update_{incident_number}" in st.session_state:
+            _update_status(incident_number)
+        if st.session_state.pop(f"update_failed_{incident_number}", False):
+            st.error("Failed to update incident. Please try again.")
+        
+        # Always show Resolve option
+        with st.expander("✅ Resolve this!", expanded=False):
+            with st.form(f"resolve_form_{incident_number}"):
+                close_notes = st.text_area("Resolution Notes", 
+                                        placeholder="Enter resolution details",
+                                        key=f"resolve_notes_{incident_number}")
+                submitted_resolve = st.form_submit_button("Submit Resolution")
+                if submitted_resolve and close_notes:
+                    _submit_update(incident_number, {
+                        "state": "6",  # Resolved state
+                        "close_notes": close_notes,
+                        "close_code": "Solution provided"
+                    }, f"Incident {incident_number} has been resolved.")
+        
+        # One hold form for both cases; only the wording changes with the state,
+        # so the widget keys stay the same when an incident goes on hold
+        if current_state == 'on hold':
+            _hold_form(incident_number, "📝 Update Hold Notes", "Update Hold Notes",
+                       f"Hold notes for incident {incident_number} have been updated.", expanded=True)
+        else:
+            _hold_form(incident_number, "⏸️ Put on Hold", "Submit Hold Request",
+                       f"Incident {incident_number} has been put on hold.")
+    
+    # Show status if already closed/resolved
+    elif current_state in ('closed', 'resolved'):
+        st.markdown(f"<div style='text-align: center; padding: 0.5rem; color: #38a169;'>✅ Ticket {current_state.title()}</div>", 
+                  unsafe_allow_html=True)
+    elif current_state == 'on hold':
+        st.markdown("<div style='text-align: center; padding: 0.5rem; color: #d69e2e;'>⏸️ On Hold</div>", 
+                  unsafe_allow_html=True)
+
+@st.fragment
 def render_incident_management():
-    """Render the Incident Management section"""
+    """Render the Incident Management section
+    
+    Runs as a fragment: paging, selecting and updating incidents rerun only
+    this section instead of the whole app.
+    """
     st.markdown("""
         <div style='text-align: center; margin: 1rem 0 2rem 0;'>
     """, unsafe_allow_html=True)
     
-    # Initialize session state variables
-    if 'incidents_data' not in st.session_state:
-        st.session_state.incidents_data = None
-    if 'show_details' not in st.session_state:
-        st.session_state.show_details = False
-    if 'selected_incident_number' not in st.session_state:
-        st.session_state.selected_incident_number = None
-    if 'scroll_position' not in st.session_state:
-        st.session_state.scroll_position = 0
-    if 'last_incident_details' not in st.session_state:
-        st.session_state.last_incident_details = None
-    if 'page' not in st.session_state:
-        st.session_state.page = 1
-    if 'rows_per_page' not in st.session_state:
-        st.session_state.rows_per_page = 10
+    # Confirm an update that finished on the previous run
+    update_notice = st.session_state.pop("incident_update_notice", None)
+    if update_notice:
+        st.toast(update_notice, icon="✅")
     
     # Add a refresh button
     if st.button("🔄 Refresh Incidents", key="refresh_incidents_list_btn"):
-        st.session_state.incidents_data = None
+        invalidate_incidents()
         st.session_state.show_details = False
         st.session_state.selected_incident_number = None
-        st.rerun()
-    
-    # Restore scroll position if available
-    if 'last_scroll_position' in st.session_state and st.session_state.last_scroll_position:
-        st.components.v1.html(st.session_state.last_scroll_position, height=0)
-        st.session_state.last_scroll_position = None
+        st.rerun(scope="fragment")
     
-    # Fetch incidents if not already in session state
-    if st.session_state.incidents_data is None:
-        with st.spinner("Loading incidents..."):
-            st.session_state.incidents_data = incident_service.fetch_incidents()
+    # Fetch the formatted incident table (served from cache between refreshes);
+    # the raw API payload is only read when the cache is refilled
+    with st.spinner("Loading incidents..."):
+        try:
+            formatted_incidents = get_formatted_incidents()
+        except Exception as e:
+            st.error(f"Error loading incidents: {str(e)}")
+            return
     
-    if st.session_state.incidents_data:
-        # Format the data using the service function
-        formatted_incidents = incident_service.format_incidents(st.session_state.incidents_data)
+    if not formatted_incidents.empty:
+        # Add pagination controls
+        col1, col2 = st.columns([1, 3])
+        with col1:
+            st.session_state.rows_per_page = st.selectbox(
+                'Rows per page:',
+                [5, 10, 20, 50],
+                index=1,
+                key='rows_per_page_select'
+            )
         
-        if formatted_incidents:
-            # Add pagination controls
-            col1, col2 = st.columns([1, 3])
-            with col1:
-                st.session_state.rows_per_page = st.selectbox(
-                    'Rows per page:',
-                    [5, 10, 20, 50],
-                    index=1,
-                    key='rows_per_page_select'
-                )
-            
-            # Calculate total pages
-            total_pages = (len(formatted_incidents) + st.session_state.rows_per_page - 1) // st.session_state.rows_per_page
-            
-            # Ensure page is within valid range
-            if st.session_state.page < 1:
-                st.session_state.page = 1
-            elif st.session_state.page > total_pages and total_pages > 0:
-                st.session_state.page = total_pages
-            
-            # Calculate start and end indices for current page
-            start_idx = (st.session_state.page - 1) * st.session_state.rows_per_page
-            end_idx = min(start_idx + st.session_state.rows_per_page, len(formatted_incidents))
-            
-            # Get current page data
-            display_data = formatted_incidents[start_idx:end_idx]
-            
-            # Display pagination info
-            st.caption(f"Showing {start_idx + 1}-{end_idx} of {len(formatted_incidents)} incidents")
-            
-            # Pagination controls
-            col1, col2, col3 = st.columns([1, 2, 1])
-            with col1:
-                if st.button("⏮️ First", disabled=st.session_state.page == 1, key="pagination_first_btn"):
-                    st.session_state.page = 1
-                    st.rerun()
-                if st.button("⬅️ Previous", disabled=st.session_state.page == 1, key="pagination_prev_btn"):
-                    st.session_state.page -= 1
-                    st.rerun()
-            with col3:
-                if st.button("Next ➡️", disabled=st.session_state.page == total_pages, key="pagination_next_btn"):
-                    st.session_state.page += 1
-                    st.rerun()
-                if st.button("Last ⏭️", disabled=st.session_state.page == total_pages, key="pagination_last_btn"):
-                    st.session_state.page = total_pages
-                    st.rerun()
-            
-            # Display current page number and total pages
-            with col2:
-                st.markdown(f"<div style='text-align: center; margin: 10px 0;'>Page {st.session_state.page} of {total_pages if total_pages > 0 else 1}</div>", 
-                           unsafe_allow_html=True)
-            # Create display data without raw_data and get current page data
-            display_data = [
-                {k: v for k, v in incident.items() if k != 'raw_data'}
-                for incident in formatted_incidents[start_idx:end_idx]
-            ]
-            
-            # Display the table with clickable incident numbers
-            st.markdown("""
-                <style>
-                    .sticky-header {
-                        position: sticky;
-                        top: 0;
-                        background: #f0f4f8;  /* Softer blue-gray background */
-                        z-index: 100;
-                        padding: 12px 0;
-                        margin: 0 0 10px 0;
-                        border-bottom: 2px solid #d9e2ec;
-                        color: #243b53;
-                        box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-                    }
-                    .sticky-header .row {
-                        font-weight: 600;
-                        color: #243b53;
-                    }
-                    .incident-row {
-                        border-bottom: 1px solid #f0f2f6;
-                        padding: 10px 0;
-                    }
-                    .incident-row:hover {
-                        background-color: #f8f9fa;
-                    }
-                </style>
-                <div class='sticky-header'>
-                    <div class='row' style='display: flex; padding: 5px 15px;'>
-                        <div style='flex: 1; color: #2d3748;'>Incident #</div>
-                        <div style='flex: 3; color: #2d3748;'>Description</div>
-                        <div style='flex: 1; color: #2d3748;'>Status</div>
-                        <div style='flex: 2; color: #2d3748;'>Created On</div>
-                    </div>
-                </div>
-            """, unsafe_allow_html=True)
-            
-            # Show incident details in a modal if an incident is selected (at the top of the table)
-            if (st.session_state.get('selected_incident_number') and 
-                st.session_state.get('show_details', False)):
-                # Find the selected incident in the current page
-                selected_incident = next(
-                    (inc for inc in display_data 
-                     if inc['Number'] == st.session_state.selected_incident_number),
-                    None
-                )
+        # Clamp the page and compute the slice for it
+        start_idx, end_idx, total_pages, page = _page_bounds(
+            len(formatted_incidents), st.session_state.rows_per_page, _current_page()
+        )
+        if page != _current_page():
+            _set_page(page)
+        
+        # Get current page data as a positional view of the cached table
+        page_df = formatted_incidents.iloc[start_idx:end_idx]
+        page_numbers = set(page_df["Number"])
+        
+        # Display pagination info
+        st.caption(f"Showing {start_idx + 1}-{end_idx} of {len(formatted_incidents)} incidents")
+        
+        # Pagination controls
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col1:
+            st.button("⏮️ First", disabled=page == 1, key="pagination_first_btn",
+                      on_click=_set_page, args=(1,))
+            st.button("⬅️ Previous", disabled=page == 1, key="pagination_prev_btn",
+                      on_click=_set_page, args=(page - 1,))
+        with col3:
+            st.button("Next ➡️", disabled=page == total_pages, key="pagination_next_btn",
+                      on_click=_set_page, args=(page + 1,))
+            st.button("Last ⏭️", disabled=page == total_pages, key="pagination_last_btn",
+                      on_click=_set_page, args=(total_pages,))
+        
+        # Display current page number and total pages
+        with col2:
+            st.markdown(f"<div style='text-align: center; margin: 10px 0;'>Page {page} of {total_pages}</div>", 
+                       unsafe_allow_html=True)
+        
+        # Show incident details in a modal if an incident is selected (at the top of the table)
+        if (st.session_state.get('selected_incident_number') and 
+            st.session_state.get('show_details', False)):
+            # Only show details for an incident on the current page
+            incident_number = st.session_state.selected_incident_number
+            if incident_number in page_numbers:
+                # Details come from the cache; updates clear it via invalidate_incidents()
+                incident_data = None
+                with st.spinner("Loading incident details..."):
+                    try:
+                        incident_details = get_incident_details(incident_number)
+                        if isinstance(incident_details, dict) and 'result' in incident_details and incident_details['result']:
+                            incident_data = incident_details['result'][0]
+                        else:
+                            st.error("No details found for this incident.")
+                            if st.button("Close Ticket", key=f"incident_management_modal_close_btn_{incident_number}"):
+                                st.session_state.show_details = False
+                                st.session_state.selected_incident_number = None
+                                st.rerun(scope="fragment")
+                    except Exception as e:
+                        st.error(f"Error loading incident details: {str(e)}")
+                        if st.button("Close Ticket", key=f"incident_management_modal_close_btn_{incident_number}"):
+                            st.session_state.show_details = False
+                            st.session_state.selected_incident_number = None
+                            st.rerun(scope="fragment")
                 
-                if selected_incident:
-                    # Store the incident number before loading details
-                    incident_number = selected_incident["Number"]
-                    
-                    # Only fetch details if we don't have them in session state or if it's a different incident
-                    if (st.session_state.last_incident_details is None or 
-                        st.session_state.last_incident_details.get('number') != incident_number):
-                        with st.spinner("Loading incident details..."):
-                            try:
-                                incident_details = incident_service.get_incident_details(incident_number)
-                                if isinstance(incident_details, dict) and 'result' in incident_details and incident_details['result']:
-                                    incident_data = incident_details['result'][0]
-                                    st.session_state.last_incident_details = incident_data
-                                else:
-                                    st.error("No details found for this incident.")
-                                    if st.button("Close Ticket", key=f"incident_management_modal_close_btn_{incident_number}"):
-                                        st.session_state.show_details = False
-                                        st.session_state.selected_incident_number = None
-                                        st.session_state.last_incident_details = None
-                                        st.rerun()
-                            except Exception as e:
-                                st.error(f"Error loading incident details: {str(e)}")
-                                if st.button("Close Ticket", key=f"incident_management_modal_close_btn_{incident_number}"):
-                                    st.session_state.show_details = False
-                                    st.session_state.selected_incident_number = None
-                                    st.session_state.last_incident_details = None
-                                    st.rerun()
-                    
-                    # Display the modal with incident details in a centered expander
-                    if st.session_state.last_incident_details:
-                        incident_data = st.session_state.last_incident_details
-                        
-                        # Create a centered container for the expander
+                # Display the modal with incident details in a centered expander
+                if incident_data:
+                    # Create a centered container for the expander
+                    with st.container(key="incident_details"):
                         col1, col2, col3 = st.columns([1, 6, 1])
                         with col2:  # Middle column (6 units wide)
                             with st.expander(f"🔍 Incident Details: {incident_number}", expanded=True):
-                                # Add some vertical space
-                                st.markdown("<div style='margin: 10px 0;'></div>", unsafe_allow_html=True)
-                                
-                                # Create two columns for the details
-                                col_a, col_b = st.columns(2)
-                                with col_a:
-                                    st.markdown("### ℹ️ Basic Information")
-                                    st.markdown(f"**Number:** {incident_data.get('number', 'N/A')}")
-                                    st.markdown(f"**Status:** {incident_data.get('state', 'N/A')}")
-                                    st.markdown(f"**Priority:** {incident_data.get('priority', 'N/A')}")
-                                    st.markdown(f"**Category:** {incident_data.get('category', 'N/A')}")
-                                
-                                with col_b:
-                                    st.markdown("### 👤 Assignment")
-                                    st.markdown(f"**Assigned To:** {incident_data.get('assigned_to', 'N/A')}")
-                                    st.markdown(f"**Assignment Group:** {incident_data.get('assignment_group', 'N/A')}")
-                                    st.markdown(f"**Opened At:** {incident_data.get('opened_at', 'N/A')}")
-                                
+                                # Keyed containers let the stylesheet space this panel only
+                                with st.container(key="incident_detail_fields"):
+                                    # Create two columns for the details
+                                    col_a, col_b = st.columns(2)
+                                    # One markdown element per column instead of one per field
+                                    with col_a:
+                                        st.markdown(
+                                            "### ℹ️ Basic Information\n\n"
+                                            f"**Number:** {incident_data.get('number', 'N/A')}  \n"
+                                            f"**Status:** {incident_data.get('state', 'N/A')}  \n"
+                                            f"**Priority:** {incident_data.get('priority', 'N/A')}  \n"
+                                            f"**Category:** {incident_data.get('category', 'N/A')}"
+                                        )
+                            
+                                    with col_b:
+                                        st.markdown(
+                                            "### 👤 Assignment\n\n"
+                                            f"**Assigned To:** {incident_data.get('assigned_to', 'N/A')}  \n"
+                                            f"**Assignment Group:** {incident_data.get('assignment_group', 'N/A')}  \n"
+                                            f"**Opened At:** {incident_data.get('opened_at', 'N/A')}"
+                                        )
+                            
                                 # Work notes section with improved styling and contrast
                                 work_notes = incident_data.get('work_notes')
                                 if work_notes and str(work_notes).strip():
@@ -817,206 +885,77 @@ def render_incident_management():
                                         f"<div style='background-color: #f0f2f6; padding: 15px; border-radius: 5px; border-left: 4px solid #4a90e2; color: #1a1a1a; line-height: 1.6; white-space: pre-wrap;'>{work_notes}</div>", 
                                         unsafe_allow_html=True
                                     )
-                                
+                            
                                 # Action buttons at the bottom
-                                st.markdown("<div style='margin-top: 20px;'></div>", unsafe_allow_html=True)
-                                
-                                # Create columns for buttons
-                                btn_col1, btn_col2 = st.columns([1, 1])
-                                
-                                with btn_col1:
-                                    if st.button("✕ Close Details", 
-                                           key=f"modal_details_close_{incident_number}",
-                                           use_container_width=True,
-                                           type="secondary"):
-                                        st.session_state.show_details = False
-                                        st.session_state.selected_incident_number = None
-                                        st.session_state.last_incident_details = None
-                                        st.rerun()
+                                with st.container(key="incident_detail_actions"):
+                                    btn_col1, btn_col2 = st.columns([1, 1])
+                            
+                                    with btn_col1:
+                                        if st.button("✕ Close Details", 
+                                               key=f"modal_details_close_{incident_number}",
+                                               use_container_width=True,
+                                               type="secondary"):
+                                            st.session_state.show_details = False
+                                            st.session_state.selected_incident_number = None
+                                            st.rerun(scope="fragment")
+                            
+                                    with btn_col2:
+                                        # Normalized once; _incident_actions compares against lowercase states
+                                        current_state = (incident_data.get('state') or '').strip().lower()
+                                        if current_state not in ('closed', 'resolved'):
+                                            if st.button("🔄 Want to update this!",
+                                                       key=f"modal_ticket_update_{incident_number}",
+                                                       use_container_width=True,
+                                                       type="primary"):
+                                                st.session_state.show_update_options = True
+                                                st.rerun(scope="fragment")
                                 
-                                with btn_col2:
-                                    current_state = incident_data.get('state', '').lower()
-                                    if current_state not in ['closed', 'resolved']:
-                                        if st.button("🔄 Want to update this!",
-                                                   key=f"modal_ticket_update_{incident_number}",
-                                                   use_container_width=True,
-                                                   type="primary"):
-                                            st.session_state.show_update_options = True
-                                            st.rerun()
-                                    
-                                    # Show update options if the update button was clicked
-                                    if st.session_state.get('show_update_options', False):
-                                        st.markdown("### Update Options")
-                                        
-                                        # Always show Resolve option
-                                        with st.expander("✅ Resolve this!", expanded=False):
-                                            with st.form(f"resolve_form_{incident_number}"):
-                                                close_notes = st.text_area("Resolution Notes", 
-                                                                        placeholder="Enter resolution details",
-                                                                        key=f"resolve_notes_{incident_number}")
-                                                submitted_resolve = st.form_submit_button("Submit Resolution")
-                                                if submitted_resolve and close_notes:
-                                                    with st.spinner("Updating incident..."):
-                                                        payload = {
-                                                            "state": "6",  # Resolved state
-                                                            "close_notes": close_notes,
-                                                            "close_code": "Solution provided"
-                                                        }
-                                                        success = incident_service.update_incident(incident_number, payload)
-                                                        if success:
-                                                            st.success(f"Incident {incident_number} has been resolved.")
-                                                            st.session_state.show_update_options = False
-                                                            st.session_state.last_incident_details = None
-                                                            st.session_state.incidents_data = None
-                                                            st.rerun()
-                                                        else:
-                                                            st.error("Failed to update incident. Please try again.")
-                                        
-                                        # Show different options based on current state
-                                        if current_state.lower() == 'on hold':
-                                            # For incidents already on hold, show "Update Hold Notes"
-                                            with st.expander("📝 Update Hold Notes", expanded=True):
-                                                with st.form(f"update_hold_form_{incident_number}"):
-                                                    hold_reason = st.text_input("Hold Reason", 
-                                                                             placeholder="Enter updated hold reason",
-                                                                             key=f"update_hold_reason_{incident_number}")
-                                                    work_notes = st.text_area("Work Notes",
-                                                                           placeholder="Enter updated work notes",
-                                                                           key=f"update_work_notes_{incident_number}")
-                                                    submitted_update_hold = st.form_submit_button("Update Hold Notes")
-                                                    if submitted_update_hold and hold_reason and work_notes:
-                                                        with st.spinner("Updating hold notes..."):
-                                                            payload = {
-                                                                "state": "3",  # Keep as On Hold
-                                                                "hold_reason": hold_reason,
-                                                                "work_notes": work_notes
-                                                            }
-                                                            success = incident_service.update_incident(incident_number, payload)
-                                                            if success:
-                                                                st.success(f"Hold notes for incident {incident_number} have been updated.")
-                                                                st.session_state.show_update_options = False
-                                                                st.session_state.last_incident_details = None
-                                                                st.session_state.incidents_data = None
-                                                                st.rerun()
-                                                            else:
-                                                                st.error("Failed to update hold notes. Please try again.")
-                                        else:
-                                            # For other statuses, show "Put on Hold"
-                                            with st.expander("⏸️ Put on Hold", expanded=False):
-                                                with st.form(f"hold_form_{incident_number}"):
-                                                    hold_reason = st.text_input("Hold Reason", 
-                                                                             placeholder="Enter reason for hold",
-                                                                             key=f"hold_reason_{incident_number}")
-                                                    work_notes = st.text_area("Work Notes",
-                                                                           placeholder="Enter work notes",
-                                                                           key=f"work_notes_{incident_number}")
-                                                    submitted_hold = st.form_submit_button("Submit Hold Request")
-                                                    if submitted_hold and hold_reason and work_notes:
-                                                        with st.spinner("Updating incident..."):
-                                                            payload = {
-                                                                "state": "3",  # On Hold state
-                                                                "hold_reason": hold_reason,
-                                                                "work_notes": work_notes
-                                                            }
-                                                            success = incident_service.update_incident(incident_number, payload)
-                                                            if success:
-                                                                st.success(f"Incident {incident_number} has been put on hold.")
-                                                                st.session_state.show_update_options = False
-                                                                st.session_state.last_incident_details = None
-                                                                st.session_state.incidents_data = None
-                                                                st.rerun()
-                                                            else:
-                                                                st.error("Failed to update incident. Please try again.")
-                                    
-                                    # Show status if already closed/resolved
-                                    elif current_state in ['closed', 'resolved']:
-                                        st.markdown("<div style='text-align: center; padding: 0.5rem; color: #38a169;'>✅ Ticket {current_state.title()}</div>", 
-                                                  unsafe_allow_html=True)
-                                    elif current_state == 'on hold':
-                                        st.markdown("<div style='text-align: center; padding: 0.5rem; color: #d69e2e;'>⏸️ On Hold</div>", 
-                                                  unsafe_allow_html=True)
-
-                            # Add some bottom margin
-                            st.markdown("<div style='margin-bottom: 20px;'></div>", unsafe_allow_html=True)
+                                        _incident_actions(incident_number, current_state)
 
-            # Create a container for the table
-            table_container = st.container()
-
-            with table_container:
-                # Display each incident as a row (only for current page)
-                for incident in display_data:
-                    # Create a clickable row for each incident
-                    col1, col2, col3, col4, col5, col6 = st.columns([1, 3, 1, 2, 1, 1])
-                    with col1:
-                        st.markdown(f"<div style='padding: 8px 0;'>{incident['Number']}</div>", unsafe_allow_html=True)
-                    with col2:
-                        st.markdown(f"<div style='padding: 8px 0;'>{incident['Description']}</div>", unsafe_allow_html=True)
-                    with col3:
-                        st.markdown(f"<div style='padding: 8px 0;'>{incident['Status']}</div>", unsafe_allow_html=True)
-                    with col4:
-                        st.markdown(f"<div style='padding: 8px 0;'>{incident['Created On']}</div>", unsafe_allow_html=True)
-                    with col5:
-                        if st.button("View", 
-                                   key=f"incident_list_view_{incident['Number']}", 
-                                   type="secondary",
-                                   help=f"View details for incident {incident['Number']}"):
-                            st.session_state.scroll_position = """
-                                <script>
-                                    window.parent.document.getElementById('root').scrollTop = document.body.scrollTop || document.documentElement.scrollTop;
-                                </script>
-                            """
-                            st.session_state.show_details = True
-                            st.session_state.selected_incident_number = incident["Number"]
-                            st.rerun()
-                    # Removed Close Ticket button from main list as per user request
-                
-                # Add some bottom margin
-                st.markdown("<div style='margin-bottom: 20px;'></div>", unsafe_allow_html=True)
-
-            
-            # The incident details modal is now shown at the top of the table
+        # Display the page as a single table; selecting a row opens its details
+        event = st.dataframe(
+            page_df,
+            use_container_width=True,
+            hide_index=True,
+            on_select="rerun",
+            selection_mode="single-row",
+            key=f"incident_table_{page}_{st.session_state.rows_per_page}"
+        )
+        selected_rows = event.selection.rows
+        selected_number = page_df["Number"].iat[selected_rows[0]] if selected_rows else None
+        
+        # Only react to a changed selection, so closing the details doesn't reopen them
+        if selected_number != st.session_state.get('table_selected_number'):
+            st.session_state.table_selected_number = selected_number
+            if selected_number:
+                st.session_state.show_details = True
+                st.session_state.selected_incident_number = selected_number
+                st.rerun(scope="fragment")
+        
+        # The incident details modal is now shown at the top of the table
 
 def render_create_ticket():
     """Render the Create Ticket form"""
-    # Initialize variables
-    if 'new_ticket_number' not in st.session_state:
-        st.session_state.new_ticket_number = None
-    if 'show_ticket_details' not in st.session_state:
-        st.session_state.show_ticket_details = False
-    if 'form_cleared' not in st.session_state:
-        st.session_state.form_cleared = False
-
     st.markdown("## 📞 Call in a Ticket")
     st.markdown("Please fill out the form below to create a new ticket.")
     
-    # Create the form with a unique key
-    form_key = "create_ticket_form"
-    if st.session_state.form_cleared:
-        form_key += "_cleared"
-    
-    with st.form(form_key):
-        # Use a different key when we want to clear the form
-        short_desc_key = "short_desc_cleared" if st.session_state.form_cleared else "short_desc"
-        desc_key = "detailed_desc_cleared" if st.session_state.form_cleared else "detailed_desc"
-        
+    # clear_on_submit empties the fields after a submit while keeping the widgets
+    with st.container(key="create_ticket"), st.form("create_ticket_form", clear_on_submit=True):
         short_description = st.text_area(
             "Short Description*", 
             placeholder="Briefly describe the issue", 
             max_chars=160,
             help="A short summary of the issue (required)",
-            key=short_desc_key
+            key="short_desc"
         )
         
         description = st.text_area(
             "Detailed Description", 
             placeholder="Provide detailed information about the issue",
             help="Include any relevant details, error messages, or steps to reproduce",
-            key=desc_key
+            key="detailed_desc"
         )
         
-        # Add some spacing
-        st.markdown("<div style='margin: 20px 0;'></div>", unsafe_allow_html=True)
-        
         # Form submission button
         submitted = st.form_submit_button("Submit Ticket", type="primary")
         
@@ -1029,13 +968,9 @@ def render_create_ticket():
                     
                     if result and 'result' in result and 'number' in result['result']:
                         ticket_number = result['result']['number']
+                        invalidate_incidents()
+                        # Announced with a toast on the rerun below
                         st.session_state.new_ticket_number = ticket_number
-                        st.session_state.show_ticket_details = True
-                        st.session_state.show_view_ticket_button = True
-                        st.session_state.ticket_short_description = short_description
-                        st.session_state.ticket_description = description
-                        # Set flag to clear form on next render
-                        st.session_state.form_cleared = not st.session_state.form_cleared
                         st.rerun()
                     else:
                         error_msg = result.get('error', 'Unknown error occurred')
@@ -1043,40 +978,23 @@ def render_create_ticket():
                         if 'response_content' in result:
                             st.text_area("Error Details", result['response_content'], height=200)
     
-    # Display success message with ticket number in a professional format
-    if st.session_state.show_ticket_details:
-        with st.container():
-            st.markdown(f"""
-                <div style='background-color: #e8f5e9; 
-                            border-left: 4px solid #4caf50;
-                            padding: 12px 20px;
-                            margin: 16px 0;
-                            border-radius: 4px;'>
-                    <p style='margin: 0; color: #1b5e20; font-weight: 500;'>
-                        Ticket #{st.session_state.new_ticket_number} has been created successfully
-                    </p>
-                </div>
-            """, unsafe_allow_html=True)
-            
-            # Show ticket details in a clean, professional format
-            st.markdown("### Ticket Details")
-            col1, col2 = st.columns([1, 3])
-            with col1:
-                st.markdown("**Ticket Number:**")
-                st.markdown("**Status:**")
-                st.markdown("**Short Description:**")
-                if st.session_state.ticket_description:
-                    st.markdown("**Description:**")
-            
-            with col2:
-                st.markdown(f"{st.session_state.new_ticket_number}")
-                st.markdown("In Progress")
-                st.markdown(f"{st.session_state.ticket_short_description}")
-                if st.session_state.ticket_description:
-                    st.markdown(f"{st.session_state.ticket_description}")
-        
-        # Auto-clear the success message after a delay
-        st.session_state.show_ticket_details = False
+    # Confirm a ticket created on the previous run; the toast leaves no layout behind
+    if st.session_state.new_ticket_number:
+        st.toast(f"Ticket #{st.session_state.new_ticket_number} created", icon="✅")
+        st.session_state.new_ticket_number = None
+
+@st.cache_resource(show_spinner=False)
+def get_confluence_client(url: str, username: str, api_token: str):
+    """A Confluence client on a keep-alive connection pool, shared by every session."""
+    from atlassian import Confluence
+    from confluence_loader import create_pooled_session
+    return Confluence(
+        url=url,
+        username=username,
+        password=api_token,
+        cloud=True,
+        session=create_pooled_session()
+    )
 
 def update_confluence_page(confluence, page_id, title, new_content):
     """Update the Confluence page with new content"""
@@ -1155,14 +1073,10 @@ def render_confluence_table():
         return
         
     try:
-        from atlassian import Confluence
-        from dotenv import load_dotenv
         import os
         import pandas as pd
         from datetime import datetime
         
-        load_dotenv()
-        
         # Get Confluence configuration from environment variables
         confluence_url = os.getenv('CONFLUENCE_URL')
         email = os.getenv('CONFLUENCE_EMAIL')
@@ -1174,13 +1088,8 @@ def render_confluence_table():
             st.error("Missing Confluence configuration in .env file")
             return
             
-        # Initialize Confluence client
-        confluence = Confluence(
-            url=confluence_url,
-            username=email,
-            password=api_token,
-            cloud=True
-        )
+        # Shared Confluence client (pooled connections, reused across reruns)
+        confluence = get_confluence_client(confluence_url, email, api_token)
         
         # Get page content with version information
         try:
@@ -1278,46 +1187,6 @@ def render_confluence_table():
                 if is_serial_col and not display_df.empty:
                     display_df[display_df.columns[0]] = range(1, len(display_df) + 1)
                 
-                # Create a container for the table with custom CSS to improve editing experience
-                st.markdown("""
-                <style>
-                    /* Remove dimming effect */
-                    .stDataFrame {
-                        --shadow: none !important;
-                    }
-                    
-                    /* Style the edit cells */
-                    .stDataFrame [data-testid='stDataFrameCell'] {
-                        padding: 0.5rem;
-                        background-color: white !important;
-                    }
-                    
-                    /* Make the table more compact and readable */
-                    .stDataFrame {
-                        font-size: 0.9rem;
-                        margin: 0 !important;
-                    }
-                    
-                    /* Remove focus outline that causes dimming */
-                    .stDataFrame:focus, .stDataFrame:focus-within {
-                        outline: none !important;
-                        box-shadow: none !important;
-                    }
-                    
-                    /* Style for editable cells */
-                    .stDataFrame [data-testid='stDataFrameCell']:focus-within {
-                        border: 1px solid #4CAF50 !important;
-                        box-shadow: 0 0 0 1px #4CAF50 !important;
-                    }
-                    
-                    /* Remove modal background */
-                    .stDataFrame [role='dialog'] {
-                        background-color: transparent !important;
-                        box-shadow: none !important;
-                    }
-                </style>
-                """, unsafe_allow_html=True)
-                
                 # Initialize session state for tracking table changes
                 if f'table_{i}_needs_update' not in st.session_state:
                     st.session_state[f'table_{i}_needs_update'] = False
@@ -1363,12 +1232,11 @@ def render_confluence_table():
                             # Get the current table data
                             current_table = st.session_state.edited_tables[i]
                             
-                            # Initialize Confluence client
-                            confluence = Confluence(
-                                url=os.getenv('CONFLUENCE_URL'),
-                                username=os.getenv('CONFLUENCE_EMAIL'),
-                                password=os.getenv('CONFLUENCE_API_TOKEN'),
-                                cloud=True
+                            # Shared Confluence client
+                            confluence = get_confluence_client(
+                                os.getenv('CONFLUENCE_URL'),
+                                os.getenv('CONFLUENCE_EMAIL'),
+                                os.getenv('CONFLUENCE_API_TOKEN')
                             )
                             
                             # Create a status container for validation progress
@@ -1427,12 +1295,17 @@ def render_confluence_table():
                             # Run async validation
                             import asyncio
                             
+                            async def validate_all():
+                                # One pooled session serves every URL in the batch
+                                async with validator:
+                                    return await validator.validate_urls(url_data)
+                            
                             # Create a new event loop for the async operation
                             def run_async_validation():
                                 loop = asyncio.new_event_loop()
                                 asyncio.set_event_loop(loop)
                                 try:
-                                    return loop.run_until_complete(validator.validate_urls(url_data))
+                                    return loop.run_until_complete(validate_all())
                                 finally:
                                     loop.close()
                             
@@ -1451,6 +1324,7 @@ def render_confluence_table():
                             
                             # Process each row in the table and update with validation results
                             formatted_results = []
+                            updated_tickets = []
                             for idx, (_, row) in enumerate(current_table.iterrows()):
                                 ticket_number = ticket_numbers[idx] if idx < len(ticket_numbers) else f'Row {idx+1}'
                                 result = results_by_ticket.get(ticket_number, {})
@@ -1468,11 +1342,11 @@ def render_confluence_table():
                                 if 'Status' in current_table.columns:
                                     current_table.at[idx, 'Status'] = formatted_result['status']
                                     
-                                    # Update the status in Confluence
+                                    # Queue the status update for Confluence
                                     if 'confluence_table' in st.session_state:
-                                        if update_confluence_table(st.session_state.confluence_table, idx, 'Status', formatted_result['status']):
-                                            update_confluence_table(st.session_state.confluence_table, idx, 'Updated_Ts_Lastrun', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-                                            st.toast(f"Updated ticket {ticket_number} in Confluence", icon="✅")
+                                        if queue_cell_update(st.session_state.confluence_table, idx, 'Status', formatted_result['status']):
+                                            queue_cell_update(st.session_state.confluence_table, idx, 'Updated_Ts_Lastrun', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+                                            updated_tickets.append(ticket_number)
                                         else:
                                             st.error(f"Failed to update status for ticket {ticket_number}")
                                 
@@ -1480,6 +1354,10 @@ def render_confluence_table():
                                 if 'details' in current_table.columns:
                                     current_table.at[idx, 'details'] = formatted_result['details']
                             
+                            # Save every queued update to Confluence in one request
+                            if updated_tickets and flush_confluence_updates(st.session_state.confluence_table):
+                                st.toast(f"Updated {len(updated_tickets)} tickets in Confluence", icon="✅")
+                            
                             # Update the session state with the modified table
                             st.session_state.edited_tables[i] = current_table
                             validation_results = formatted_results
@@ -1546,6 +1424,7 @@ def render_confluence_table():
 
 def main():
     """Main application"""
+    st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
     initialize_session_state()
     reload_data = render_sidebar()
     
@@ -1567,18 +1446,13 @@ def main():
     with tab2:
         st.session_state.active_tab = "New Ticket"
         st.caption("Create a new support ticket for any issues or requests")
-        # Clear form data when switching to the ticket creation tab
-        if 'form_short_description' not in st.session_state:
-            st.session_state.form_short_description = ""
-            st.session_state.form_description = ""
         render_create_ticket()
         
     with tab3:
         st.session_state.active_tab = "Chat"
         st.caption("Chat with the AI assistant for quick help and information")
         
-        # The RAG system is now initialized when the app starts via the cached function
-        # Just render the chat interface directly
+        # The RAG system is initialized by render_chat on the first question
         render_chat()
             
     with tab4:
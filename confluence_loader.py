@@ -4,8 +4,12 @@ Confluence Page Fetcher for TriageBot
 This module provides functionality to fetch and display pages from Confluence.
 """
 from typing import List, Dict, Any, Optional
+from collections import OrderedDict
 from dataclasses import dataclass
 from atlassian import Confluence
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import os
 from dotenv import load_dotenv
 import logging
@@ -26,20 +30,40 @@ class ConfluenceConfig:
     space_key: str
     limit: int = 100  # Default limit for number of pages to fetch
 
+def create_pooled_session(pool_connections: int = 10, pool_maxsize: int = 20) -> requests.Session:
+    """Create a requests Session that keeps HTTPS connections alive between calls."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(total=3, backoff_factor=0.3)
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
 class ConfluenceFetcher:
+    # Maximum number of fully fetched pages kept in memory
+    page_cache_size: int = 128
+    
     def __init__(self, config: ConfluenceConfig):
         """Initialize the Confluence fetcher with configuration."""
         self.config = config
+        self.session = create_pooled_session()
         self.confluence = self._get_confluence_client()
+        # Fetched pages keyed by (page_id, version.number), least recently used first
+        self._page_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self._cached_versions: Dict[str, int] = {}
         
     def _get_confluence_client(self) -> Confluence:
-        """Create and return a Confluence client instance."""
+        """Create and return a Confluence client instance using the pooled session."""
         is_cloud = 'atlassian.net' in self.config.url
         return Confluence(
             url=self.config.url,
             username=self.config.username,
             password=self.config.api_token,
-            cloud=is_cloud
+            cloud=is_cloud,
+            session=self.session
         )
     
     def list_pages(self) -> List[Dict[str, Any]]:
@@ -65,36 +89,75 @@ class ConfluenceFetcher:
             logger.error(f"Failed to fetch pages from Confluence: {str(e)}")
             raise
     
+    def _page_summary(self, page: Dict[str, Any]) -> Dict[str, Any]:
+        """Project a Confluence page response onto its listing fields."""
+        return {
+            'id': page['id'],
+            'title': page['title'],
+            'url': f"{self.config.url}/wiki{page['_links']['webui']}",
+            'version': page['version']['number'],
+            'last_updated': page['version']['when']
+        }
+    
+    def _child_pages(self, page_id: str, page: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Summaries of the child pages embedded in a page response."""
+        # Child pages arrive embedded in the response; only fall back to a
+        # separate listing call when the embedded page of results is truncated
+        embedded = page.get('children', {}).get('page', {})
+        children = embedded.get('results', [])
+        if 'next' in embedded.get('_links', {}):
+            children = self.confluence.get_page_child_by_type(
+                page_id=page_id,
+                type='page',
+                start=0,
+                limit=100,
+                expand='version'
+            )
+        return [self._page_summary(child) for child in children]
+    
+    def get_page_meta(self, page_id: str, with_children: bool = False) -> Optional[Dict[str, Any]]:
+        """Get a page's title, URL and version without its body.
+        
+        With ``with_children`` the child listing is included as 'child_pages'.
+        """
+        try:
+            expand = 'version,children.page.version' if with_children else 'version'
+            page = self.confluence.get_page_by_id(page_id=page_id, expand=expand)
+            meta = self._page_summary(page)
+            if with_children:
+                meta['child_pages'] = self._child_pages(page_id, page)
+            return meta
+        except Exception as e:
+            logger.error(f"Failed to fetch metadata for page {page_id}: {str(e)}")
+            return None
+    
     def get_page_content(self, page_id: str) -> Optional[Dict[str, Any]]:
-        """Get the content of a specific page by ID."""
+        """Get the content of a specific page by ID.
+        
+        Pages are memoized by (page_id, version.number). Revisiting a page only
+        costs a body-less metadata request; the cached body is reused while the
+        version is unchanged and the child listing is refreshed from that request.
+        """
+        cached_version = self._cached_versions.get(page_id)
+        if cached_version is not None:
+            meta = self.get_page_meta(page_id, with_children=True)
+            key = (page_id, meta['version']) if meta else None
+            if key == (page_id, cached_version):
+                self._page_cache.move_to_end(key)
+                return {**self._page_cache[key], 'child_pages': meta['child_pages']}
+        
         try:
             logger.info(f"Fetching Confluence page with ID: {page_id}")
             
-            # Get the specific page
+            # Get the page together with its child listing in a single request
             page = self.confluence.get_page_by_id(
                 page_id=page_id,
-                expand='body.storage,version,space,ancestors,children.page'
+                expand='body.storage,version,space,ancestors,children.page.version'
             )
             
-            # Get child pages if they exist
-            child_pages = []
-            if '_links' in page and 'children' in page['_links']:
-                children = self.confluence.get_page_child_by_type(
-                    page_id=page_id,
-                    type='page',
-                    start=0,
-                    limit=100,
-                    expand='page.version'
-                )
-                if 'results' in children:
-                    child_pages = [{
-                        'id': child['id'],
-                        'title': child['title'],
-                        'url': f"{self.config.url}/wiki{child['_links']['webui']}",
-                        'last_updated': child['version']['when']
-                    } for child in children['results']]
+            child_pages = self._child_pages(page_id, page)
             
-            return {
+            result = {
                 'id': page_id,
                 'title': page['title'],
                 'content': page['body']['storage']['value'],
@@ -104,10 +167,25 @@ class ConfluenceFetcher:
                 'last_updated': page['version']['when'],
                 'child_pages': child_pages
             }
+            self._cache_page(result)
+            return result
             
         except Exception as e:
             logger.error(f"Failed to fetch page {page_id}: {str(e)}")
             return None
+    
+    def _cache_page(self, page: Dict[str, Any]) -> None:
+        """Store a fetched page, replacing older versions and evicting the LRU entry."""
+        page_id = page['id']
+        stale_version = self._cached_versions.pop(page_id, None)
+        if stale_version is not None:
+            self._page_cache.pop((page_id, stale_version), None)
+        
+        self._page_cache[(page_id, page['version'])] = page
+        self._cached_versions[page_id] = page['version']
+        if len(self._page_cache) > self.page_cache_size:
+            (evicted_id, _), _ = self._page_cache.popitem(last=False)
+            self._cached_versions.pop(evicted_id, None)
 
 def setup_confluence_config() -> ConfluenceConfig:
     """Create and return a ConfluenceConfig from environment variables."""
@@ -168,19 +168,21 @@ class ConfluenceTable:
             bool: True if save was successful, False otherwise
         """
         try:
-            # Reconstruct the table HTML with updated content
-            table_html = '<table><tbody>\n'
+            # Reconstruct the table HTML with updated content; parts are
+            # collected in a list and joined once instead of concatenated
+            col_indices = sorted(self.column_mapping.keys())
+            parts = ['<table><tbody>\n']
             
             # Add header row with proper HTML formatting
-            table_html += '<tr>'
-            for col_index in sorted(self.column_mapping.keys()):
+            parts.append('<tr>')
+            for col_index in col_indices:
                 header = self.column_mapping[col_index]
-                table_html += f'<th><p><strong>{header.title()}</strong></p></th>'
-            table_html += '</tr>\n'
+                parts.append(f'<th><p><strong>{header.title()}</strong></p></th>')
+            parts.append('</tr>\n')
             # Add data rows
             for row in self.table_data:
-                table_html += '<tr>'
-                for col_index in sorted(self.column_mapping.keys()):
+                parts.append('<tr>')
+                for col_index in col_indices:
                     cell_key = f'cell_{col_index}'
                     if cell_key in row:
                         # Preserve the HTML structure of the cell content
@@ -188,11 +190,12 @@ class ConfluenceTable:
                         # If the cell content doesn't have <p> tags, add them
                         if not cell_content.strip().startswith('<p>'):
                             cell_content = f'<p>{cell_content}</p>'
-                        table_html += f'<td>{cell_content}</td>'
+                        parts.append(f'<td>{cell_content}</td>')
                     else:
-                        table_html += '<td><p></p></td>'
-                table_html += '</tr>\n'
-            table_html += '</tbody></table>'
+                        parts.append('<td><p></p></td>')
+                parts.append('</tr>\n')
+            parts.append('</tbody></table>')
+            table_html = ''.join(parts)
             
             # Get the current page to preserve the title
             page = self.confluence.get_page_by_id(page_id=self.page_id)
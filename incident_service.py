@@ -1,5 +1,6 @@
 import json
 import requests
+from operator import itemgetter
 from typing import Dict, List, Optional
 
 def fetch_incidents() -> Optional[Dict]:
@@ -333,17 +334,18 @@ def format_incidents(incidents_data: Dict) -> List[Dict]:
     if not incidents_data or 'result' not in incidents_data:
         return []
         
-    formatted_incidents = []
-    for incident in incidents_data.get('result', []):
-        formatted_incidents.append({
+    formatted_incidents = [
+        {
             "Number": incident.get('number', 'N/A'),
             "Description": incident.get('description', 'No description'),
             "Status": incident.get('state', 'N/A'),
             "Created On": incident.get('sys_created_on', 'N/A'),
             "raw_data": incident  # Store raw data for details
-        })
+        }
+        for incident in incidents_data.get('result', [])
+    ]
     
     # Sort incidents by 'Created On' in descending order (newest first)
-    formatted_incidents.sort(key=lambda x: x["Created On"], reverse=True)
+    formatted_incidents.sort(key=itemgetter("Created On"), reverse=True)
     
     return formatted_incidents
@@ -10,6 +10,7 @@ interactive query loop.
 import os  # For file system operations and environment variables
 import sys  # For system-specific parameters and functions
 import argparse  # For parsing command-line arguments
+from functools import lru_cache  # For caching the Pinecone client across initializations
 # Third-party imports
 from dotenv import load_dotenv  # For loading environment variables from .env file
 
@@ -24,6 +25,29 @@ from rag_chain import create_rag_chain, query_rag_chain  # For RAG chain creatio
 from pinecone import Pinecone  # For Pinecone client operations
 from langchain_pinecone import PineconeVectorStore  # For Pinecone vector store operations
 
+@lru_cache(maxsize=None)
+def get_pinecone_client(pinecone_api_key: str) -> Pinecone:
+    """
+    Return a Pinecone client shared by every initialization in this process.
+    
+    Args:
+        pinecone_api_key: API key for the Pinecone service
+        
+    Returns:
+        A cached Pinecone client for the given API key
+    """
+    return Pinecone(api_key=pinecone_api_key)
+
+@lru_cache(maxsize=None)
+def index_exists(pinecone_api_key: str, index_name: str) -> bool:
+    """
+    Check (once per process) whether the given Pinecone index exists.
+    
+    The result is cached so repeated initializations skip the control-plane
+    round-trip; call ``index_exists.cache_clear()`` after creating an index.
+    """
+    return index_name in get_pinecone_client(pinecone_api_key).list_indexes().names()
+
 def initialize_system(reload_data: bool = False):
     """
     Initialize and configure all components of the RAG system.
@@ -55,12 +79,10 @@ def initialize_system(reload_data: bool = False):
         if not pinecone_api_key or not mistral_api_key:
             raise ValueError("Missing required API keys. Please set PINECONE_API_KEY and MISTRAL_API_KEY in .env file")
         
-        # Initialize Pinecone client
-        pc = Pinecone(api_key=pinecone_api_key)
         index_name = "incident-chatbot"
         
         # Check if we need to load and process data
-        if reload_data or index_name not in pc.list_indexes().names():
+        if reload_data or not index_exists(pinecone_api_key, index_name):
             print("Loading and processing incident data...")
             # Load and process documents
             # Load documents from the API endpoint
@@ -79,6 +101,8 @@ def initialize_system(reload_data: bool = False):
             vector_store = create_vector_store(processed_docs, pinecone_api_key)
             if not vector_store:
                 raise RuntimeError("Failed to create vector store")
+            # The index now exists; drop the cached negative lookup
+            index_exists.cache_clear()
         else:
             print("Using existing vector store...")
             # Just connect to the existing vector store
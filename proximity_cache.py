@@ -0,0 +1,82 @@
+"""
+Proximity Cache Module
+
+This module provides an approximate answer cache keyed by query embeddings, so
+near-duplicate questions can be answered without another retrieval + LLM call.
+"""
+from collections import OrderedDict
+from typing import Hashable, List, Optional, Sequence
+
+import numpy as np
+
+
+class ProximityCache:
+    """LRU cache of answers looked up by cosine distance between query embeddings.
+
+    Entries are grouped by a scope (e.g. search mode and the incident numbers in
+    the query). Only entries in the same scope are compared, because questions
+    about different incidents embed almost identically.
+    """
+
+    def __init__(self, capacity: int = 128, tau: float = 0.05):
+        """Initialize the cache.
+
+        Args:
+            capacity: Maximum number of cached answers
+            tau: Maximum cosine distance for a cached answer to be reused
+        """
+        self.capacity = capacity
+        self.tau = tau
+        # (scope, slot) -> answer, least recently used first
+        self._answers: "OrderedDict[tuple, str]" = OrderedDict()
+        # Normalized embedding matrix, one row per slot
+        self._embeddings: Optional[np.ndarray] = None
+        self._scopes: List[Hashable] = []
+        self._free: List[int] = []
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def lookup(self, embedding: Sequence[float], scope: Hashable = None) -> Optional[str]:
+        """Return the cached answer closest to ``embedding`` within ``scope``, if close enough."""
+        if not self._answers:
+            return None
+
+        query = self._normalize(embedding)
+        slots = [slot for slot, entry_scope in enumerate(self._scopes)
+                 if entry_scope == scope and (scope, slot) in self._answers]
+        if not slots:
+            return None
+
+        # One matrix-vector product gives the cosine distance to every candidate
+        distances = 1.0 - self._embeddings[slots] @ query
+        best = int(np.argmin(distances))
+        if distances[best] > self.tau:
+            return None
+
+        key = (scope, slots[best])
+        self._answers.move_to_end(key)
+        return self._answers[key]
+
+    def insert(self, embedding: Sequence[float], answer: str, scope: Hashable = None) -> None:
+        """Cache ``answer`` for ``embedding`` in ``scope``, evicting the LRU entry when full."""
+        vector = self._normalize(embedding)
+
+        if len(self._answers) >= self.capacity:
+            (_, slot), _ = self._answers.popitem(last=False)
+            self._free.append(slot)
+
+        if self._free:
+            slot = self._free.pop()
+            self._embeddings[slot] = vector
+            self._scopes[slot] = scope
+        else:
+            slot = len(self._scopes)
+            row = vector[np.newaxis, :]
+            self._embeddings = row if self._embeddings is None else np.vstack([self._embeddings, row])
+            self._scopes.append(scope)
+
+        self._answers[(scope, slot)] = answer
@@ -5,6 +5,8 @@ This module implements a question-answering system that combines document retrie
 with language model generation to provide accurate responses about ServiceNow incidents.
 """
 from typing import Dict, Any
+import logging
+import re
 # Import required LangChain components
 from langchain.chains import create_retrieval_chain
 from langchain.chains.combine_documents import create_stuff_documents_chain
@@ -12,6 +14,24 @@ from langchain_core.prompts import ChatPromptTemplate
 # Import Mistral AI chat model for response generation
 from langchain_mistralai import ChatMistralAI
 
+logger = logging.getLogger(__name__)
+
+# Common greeting patterns, compiled once into a single alternation
+_GREETING_RE = re.compile(
+    r'^(?:'
+    r'(hi|hello|hey|greetings|good\s(morning|afternoon|evening|day))\b'
+    r'|how\s(are\s(you|things)|is\sit\sgoing)\??$'
+    r'|what\'?s?\s+up\??$'
+    r'|yo\b'
+    r'|hiya\b'
+    r'|howdy\b'
+    r'|hola\b'
+    r'|g\'?day\b'
+    r'|sup\??$'
+    r')',
+    re.IGNORECASE
+)
+
 def create_rag_chain(retriever, mistral_api_key: str):
     """
     Create a Retrieval-Augmented Generation (RAG) chain optimized for incident management.
@@ -181,10 +201,10 @@ def create_rag_chain(retriever, mistral_api_key: str):
     
     async def process_retrieved_docs(inputs):
         from langchain_core.documents import Document
-        import re
         
         query = inputs.get("input", "").strip()
         search_mode = inputs.get("search_mode", "general")
+        stream = inputs.get("stream", False)
         
         if not query:
             return {
@@ -194,21 +214,8 @@ def create_rag_chain(retriever, mistral_api_key: str):
                 "source_documents": []
             }
             
-        # Common greeting patterns
-        greeting_patterns = [
-            r'^(hi|hello|hey|greetings|good\s(morning|afternoon|evening|day))\b',
-            r'^how\s(are\s(you|things)|is\sit\sgoing)\??$',
-            r'^what\'?s?\s+up\??$',
-            r'^yo\b',
-            r'^hiya\b',
-            r'^howdy\b',
-            r'^hola\b',
-            r'^g\'?day\b',
-            r'^sup\??$'
-        ]
-        
         # Check if the query is just a greeting
-        is_greeting = any(re.match(pattern, query, re.IGNORECASE) for pattern in greeting_patterns)
+        is_greeting = _GREETING_RE.match(query) is not None
         
         if is_greeting:
             return {
@@ -221,7 +228,6 @@ def create_rag_chain(retriever, mistral_api_key: str):
         # Handle both sync and async retrievers
         import asyncio
         import inspect
-        import re
         
         try:
             # Get documents from retriever with error handling and pass search_mode
@@ -229,28 +235,25 @@ def create_rag_chain(retriever, mistral_api_key: str):
                 # Check if retriever is a callable that accepts search_mode
                 retriever_kwargs = {"search_mode_override": search_mode}
                 
-                # Debug: Print retriever function details
-                print(f"[DEBUG] Process_retrieved_docs - Search mode: {search_mode}")
-                print(f"[DEBUG] Retriever function: {retriever.__name__ if hasattr(retriever, '__name__') else type(retriever)}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("process_retrieved_docs search_mode=%s retriever=%s",
+                                 search_mode, getattr(retriever, '__name__', type(retriever)))
                 
+                accepts_mode = hasattr(retriever, '__code__') and 'search_mode_override' in retriever.__code__.co_varnames
                 if inspect.iscoroutinefunction(retriever):
-                    print("[DEBUG] Retriever is a coroutine function")
-                    if hasattr(retriever, '__code__') and 'search_mode_override' in retriever.__code__.co_varnames:
-                        print("[DEBUG] Retriever accepts search_mode_override parameter")
+                    if accepts_mode:
                         docs = await retriever(query, **retriever_kwargs)
                     else:
-                        print("[DEBUG] Retriever does not accept search_mode_override parameter")
                         docs = await retriever(query)
                 else:
-                    print("[DEBUG] Retriever is a regular function")
-                    if hasattr(retriever, '__code__') and 'search_mode_override' in retriever.__code__.co_varnames:
-                        print("[DEBUG] Retriever accepts search_mode_override parameter")
+                    if accepts_mode:
                         docs = retriever(query, **retriever_kwargs)
                     else:
-                        print("[DEBUG] Retriever does not accept search_mode_override parameter")
                         docs = retriever(query)
                 
-                print(f"[DEBUG] Retrieved {len(docs) if docs else 0} documents")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Retrieved %d documents (coroutine=%s, search_mode_override=%s)",
+                                 len(docs) if docs else 0, inspect.iscoroutinefunction(retriever), accepts_mode)
             except Exception as e:
                 print(f"Error in retriever: {str(e)}")
                 docs = []
@@ -378,11 +381,18 @@ def create_rag_chain(retriever, mistral_api_key: str):
                     "context": documents
                 }
                 
-                # Debug: Print chain input structure
-                print(f"Chain input structure: {type(chain_input)}")
-                print(f"Context type: {type(chain_input['context'])}")
-                if chain_input['context']:
-                    print(f"First context item type: {type(chain_input['context'][0])}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Chain input: %d context documents, first=%s", len(documents),
+                                 type(documents[0]) if documents else None)
+                
+                # When streaming, hand back the token stream instead of waiting
+                # for the complete answer; the caller drives it
+                if stream:
+                    return {
+                        "input": query,
+                        "context": docs,
+                        "answer_stream": document_chain.astream(chain_input)
+                    }
                 
                 # Invoke the appropriate method based on chain type
                 if inspect.iscoroutinefunction(document_chain.ainvoke):
@@ -430,7 +440,7 @@ def create_rag_chain(retriever, mistral_api_key: str):
 
 
 
-from typing import Union, Awaitable, Callable, Dict, Any
+from typing import Union, Awaitable, Callable, Dict, Any, Iterator, Optional
 import asyncio
 import inspect
 
@@ -451,6 +461,10 @@ def query_rag_chain(rag_chain: Union[Callable, Awaitable], query: str, search_mo
     """
     Query the RAG chain with proper error handling and document validation.
     
+    This waits for the complete answer and returns it with its source
+    documents. Callers that display the answer as it is generated should use
+    stream_rag_chain instead.
+    
     Args:
         rag_chain: The RAG chain to query (can be sync or async)
         query: The user's query string
@@ -520,4 +534,91 @@ def query_rag_chain(rag_chain: Union[Callable, Awaitable], query: str, search_mo
             "input": query,
             "context": [],
             "answer": f"An error occurred while processing your query: {str(e)}. Please try again with a different query."
-        }
\ No newline at end of file
+        }
+
+def stream_rag_chain(rag_chain: Union[Callable, Awaitable], query: str, search_mode: str = 'general',
+                     status: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+    """
+    Query the RAG chain and yield the answer as the model generates it.
+    
+    Retrieval runs first; the LLM's tokens are then yielded as they arrive.
+    Greetings, empty results and errors are yielded as a single chunk.
+    
+    Args:
+        rag_chain: The RAG chain to query (can be sync or async)
+        query: The user's query string
+        search_mode: The search mode to use ('incident_number', 'general', or 'mmr_only')
+        status: Optional dict the caller reads once the stream is exhausted;
+            'from_llm' is set to True only when the whole answer was generated
+            by the model (not a greeting, fallback or error text), and 'error'
+            holds the message of a failure that cut the answer short
+        
+    Yields:
+        Pieces of the answer text
+    """
+    if status is None:
+        status = {}
+    status['from_llm'] = False
+    
+    if not query or not isinstance(query, str) or not query.strip():
+        yield "Please provide a valid query."
+        return
+    
+    input_data = {
+        "input": query.strip(),
+        "search_mode": search_mode,
+        "search_kwargs": {"search_mode_override": search_mode},
+        "stream": True
+    }
+    
+    # Script threads have no event loop; one created here is closed when done
+    created_loop = None
+    try:
+        loop = asyncio.get_event_loop()
+    except RuntimeError:
+        loop = created_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+    
+    yielded = False
+    try:
+        if asyncio.iscoroutinefunction(rag_chain):
+            response = loop.run_until_complete(rag_chain(input_data))
+        else:
+            response = rag_chain(input_data)
+        
+        answer_stream = response.get("answer_stream")
+        if answer_stream is None:
+            answer = response.get("answer", "")
+            if isinstance(answer, dict):
+                answer = answer.get("answer", "")
+            yield str(answer)
+            return
+        
+        # Pull tokens off the async stream one at a time on this thread's loop
+        try:
+            while True:
+                try:
+                    chunk = loop.run_until_complete(answer_stream.__anext__())
+                except StopAsyncIteration:
+                    break
+                if chunk:
+                    yielded = True
+                    yield chunk
+            status['from_llm'] = True
+        finally:
+            loop.run_until_complete(answer_stream.aclose())
+    
+    except Exception as e:
+        import traceback
+        error_trace = traceback.format_exc()
+        print(f"Error in stream_rag_chain: {str(e)}\n{error_trace}")
+        if yielded:
+            # Part of the answer is already out; report the failure separately
+            status['error'] = str(e)
+            return
+        yield f"An error occurred while processing your query: {str(e)}. Please try again with a different query."
+    
+    finally:
+        if created_loop is not None:
+            asyncio.set_event_loop(None)
+            created_loop.close()
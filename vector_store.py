@@ -5,6 +5,7 @@ This module handles the creation and management of vector embeddings using Pinec
 allowing for efficient similarity search over document collections.
 """
 import os
+from functools import lru_cache
 from typing import List
 # Import HuggingFace for generating document embeddings
 from langchain.embeddings import HuggingFaceEmbeddings
@@ -14,10 +15,13 @@ from langchain_pinecone import PineconeVectorStore
 # Document schema for type hints
 from langchain.schema import Document
 
+@lru_cache(maxsize=1)
 def get_embeddings():
     """
     Initialize and configure HuggingFace embeddings model.
     
+    The model is loaded once per process and shared by every caller.
+    
     Returns:
         HuggingFaceEmbeddings: Configured embeddings model
         